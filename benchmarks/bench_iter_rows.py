@@ -0,0 +1,73 @@
+"""Benchmark pdutil.iter.iter_rows against pandas row iteration.
+
+Run, with pdutil installed, with:
+
+    python benchmarks/bench_iter_rows.py [num_rows]
+"""
+
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+import pdutil
+
+
+def _df(num_rows):
+    rng = np.random.RandomState(0)
+    return pd.DataFrame(
+        {
+            "id": np.arange(num_rows),
+            "price": rng.rand(num_rows),
+            "qty": rng.randint(0, 100, num_rows),
+            "name": rng.choice(["Jen", "Ray", "Fin"], num_rows),
+            "time": pd.Timestamp("2019-01-01")
+            + pd.to_timedelta(np.arange(num_rows), "s"),
+        }
+    )
+
+
+def _consume(rows):
+    for _ in rows:
+        pass
+
+
+CANDIDATES = [
+    ("DataFrame.iterrows", lambda df: _consume(df.iterrows())),
+    ("DataFrame.itertuples", lambda df: _consume(df.itertuples())),
+    (
+        "DataFrame.to_dict('records')",
+        lambda df: _consume(df.to_dict("records")),
+    ),
+    (
+        "iter_rows(df, 'tuple')",
+        lambda df: _consume(pdutil.iter.iter_rows(df)),
+    ),
+    (
+        "iter_rows(df, 'object')",
+        lambda df: _consume(pdutil.iter.iter_rows(df, "object")),
+    ),
+    (
+        "iter_rows(sub_dfs_by_size(df, 10000))",
+        lambda df: _consume(
+            pdutil.iter.iter_rows(pdutil.iter.sub_dfs_by_size(df, 10000))
+        ),
+    ),
+]
+
+
+def main(num_rows=100000):
+    df = _df(num_rows)
+    print("Iterating over {} rows of {} columns:".format(*df.shape))
+    for name, func in CANDIDATES:
+        seconds = min(timeit.repeat(lambda: func(df), number=1, repeat=3))
+        print(
+            "{:<40} {:>9.4f}s {:>12,.0f} rows/s".format(
+                name, seconds, num_rows / seconds
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -2,6 +2,11 @@ from .display import (
     df_string,
     big_dataframe_setup,
     df_to_html,
+    iter_df_string,
+    write_df_string,
+    iter_df_html,
+    write_df_html,
+    df_summary_string,
 )
 
 
@@ -1,9 +1,215 @@
 """Dataframe display-related functions."""
 
+import functools
+import itertools
 import sys
+import threading
 
 import numpy as np
 import pandas as pd
+from pandas.io.formats.printing import pprint_thing
+
+from pdutil.iter import sub_dfs_by_size
+from pdutil.iter.iter import _random_state
+
+# floats of larger magnitude are formatted by python, as their cents are not
+# exactly representable as float64
+_MAX_VECTORIZED = 1e13
+
+
+def _digit_chars(values):
+    """Returns the '{:,.2f}' formatting of the given rounded cents, as UCS4.
+
+    The returned array has a row of character codes per given value, padded
+    with zeros on the right.
+    """
+    cents = np.abs(values).astype(np.int64)
+    whole = cents // 100
+    num_digits = np.ones(len(cents), dtype=np.int64)
+    power = 10
+    while power <= whole.max(initial=0):
+        num_digits += whole >= power
+        power *= 10
+    num_commas = (num_digits - 1) // 3
+    lengths = np.signbit(values) + num_digits + num_commas + 3
+    chars = np.zeros((len(cents), lengths.max(initial=1)), dtype=np.uint32)
+    rows = np.arange(len(cents))
+    chars[rows, lengths - 1] = ord("0") + cents % 10
+    chars[rows, lengths - 2] = ord("0") + cents // 10 % 10
+    chars[rows, lengths - 3] = ord(".")
+    for digit in range(num_digits.max(initial=0)):
+        has = digit < num_digits
+        positions = lengths[has] - 4 - digit - digit // 3
+        chars[rows[has], positions] = ord("0") + whole[has] // 10**digit % 10
+        if digit % 3 == 0 and digit:
+            chars[rows[has], positions + 1] = ord(",")
+    chars[np.signbit(values), 0] = ord("-")
+    return chars
+
+
+def _float_strings(values, suffix=""):
+    """Returns the given floats formatted with '{:,.2f}', vectorized.
+
+    Example
+    -------
+    >>> _float_strings([1234567.891, -0.005, float('nan')], ' %')
+    array(['1,234,567.89 %', '-0.01 %', 'nan %'], dtype='<U14')
+    """
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(invalid="ignore", over="ignore"):
+        cents = values * 100
+        rounded = np.rint(cents)
+        # the product is inexact, so its rounding - half to even, like that
+        # of str.format - might only differ from the exact one near ties
+        near_tie = np.abs(np.abs(cents - rounded) - 0.5) <= 2 * np.spacing(
+            np.abs(cents)
+        )
+        vectorized = (np.abs(values) < _MAX_VECTORIZED) & ~near_tie
+    chars = _digit_chars(rounded[vectorized])
+    strings = np.empty(len(values), dtype="U{}".format(chars.shape[1]))
+    strings[vectorized] = chars.view(strings.dtype).ravel()
+    rest = np.flatnonzero(~vectorized)
+    if len(rest):
+        rest_strings = ["{:,.2f}".format(value) for value in values[rest]]
+        width = max(chars.shape[1], max(map(len, rest_strings)))
+        strings = strings.astype("U{}".format(width))
+        strings[rest] = rest_strings
+    if suffix:
+        strings = np.char.add(strings, suffix)
+    return strings
+
+
+def _justify(strings, width, mode):
+    """Justifies the given strings to the given width as pandas does."""
+    if mode == "left":
+        return np.char.ljust(strings, width)
+    if mode == "center":
+        return np.char.center(strings, width)
+    return np.char.rjust(strings, width)
+
+
+def _float_column_lines(label, values, suffix, justify):
+    """Returns the header and value lines of a formatted float column."""
+    strings = _float_strings(values, suffix)
+    strings[np.isnan(values)] = "NaN"
+    values_width = np.char.str_len(strings).max()
+    width = max(len(label), values_width)
+    strings = _justify(np.char.rjust(strings, values_width), width, justify)
+    header = _justify(np.array([label]), width, justify)
+    return np.concatenate((header, strings))
+
+
+def _fast_columns(df, percentage_columns, format_map):
+    """Returns the suffixes of columns df_string can format vectorized."""
+    if isinstance(df.columns, pd.MultiIndex) or df.columns.name is not None:
+        return {}
+    format_map = format_map or {}
+    fast_columns = {}
+    for i, (col, dtype) in enumerate(df.dtypes.items()):
+        if (
+            dtype == "float64"
+            and isinstance(col, str)
+            and col.isprintable()
+            and col not in format_map
+        ):
+            fast_columns[i] = " %" if col in percentage_columns else ""
+    return fast_columns
+
+
+def _column_edges(header, labels, start):
+    """Returns where right-justified column labels end in a header line."""
+    edges = []
+    for label in labels:
+        if (
+            not isinstance(label, str)
+            or not label.isprintable()
+            or label != label.strip()
+            or not label
+        ):
+            return None
+        position = header.find(label, start)
+        if position < 0:
+            return None
+        edges.append(position + len(label))
+        start = edges[-1] + 1
+    if edges[-1] != len(header):
+        return None
+    return edges
+
+
+def _fast_df_string(df, formatters, fast_columns):
+    """Renders the given dataframe like to_string, but vectorized.
+
+    The row index and the given fast columns are formatted with vectorized
+    numpy string operations, while pandas renders all remaining columns at
+    once, and its lines are cut into runs of adjacent columns to stitch
+    together with the rest. None is returned for dataframes this does not
+    render identically to to_string.
+    """
+    index = df.index
+    justify = pd.get_option("display.colheader_justify")
+    if (
+        len(df) == 0
+        or not fast_columns
+        or isinstance(index, pd.MultiIndex)
+        or index.name is not None
+        or not isinstance(index.dtype, np.dtype)
+        or not np.issubdtype(index.dtype, np.integer)
+        or justify != "right"
+        or pd.get_option("display.unicode.east_asian_width")
+    ):
+        return None
+    max_colwidth = pd.get_option("display.max_colwidth")
+    index_values = index.to_numpy()
+    index_lines = index_values.astype(str)
+    if (index_values < 0).any() and not isinstance(index, pd.RangeIndex):
+        # pandas aligns signs, i.e. pads non-negative integers with a space
+        index_lines = np.where(
+            index_values < 0, index_lines, np.char.add(" ", index_lines)
+        )
+    index_lines = np.concatenate(([""], index_lines))
+    index_width = np.char.str_len(index_lines).max()
+    blocks = [np.char.ljust(index_lines, index_width).tolist()]
+    others = [i for i in range(len(df.columns)) if i not in fast_columns]
+    if others:
+        rendered = df.iloc[:, others].to_string(formatters=formatters)
+        rendered = rendered.split("\n")
+        edges = _column_edges(rendered[0], df.columns[others], index_width + 1)
+        if edges is None:
+            return None
+        starts = [index_width + 1] + [edge + 1 for edge in edges[:-1]]
+        others = dict(zip(others, zip(starts, edges)))
+    run_start = None
+    for i in range(len(df.columns)):
+        if i in others:
+            if run_start is None:
+                run_start = others[i][0]
+            if i + 1 not in others:
+                run_end = others[i][1]
+                blocks.append([line[run_start:run_end] for line in rendered])
+                run_start = None
+            continue
+        lines = _float_column_lines(
+            df.columns[i], df.iloc[:, i].to_numpy(), fast_columns[i], justify
+        )
+        if max_colwidth is not None and len(lines[0]) > max_colwidth:
+            return None
+        blocks.append(lines.tolist())
+    return "\n".join(map(" ".join, zip(*blocks)))
+
+
+def _df_string_formatters(df, percentage_columns=(), format_map=None):
+    """Returns the to_string formatters df_string uses for a dataframe."""
+    formatters_map = {}
+    for col, dtype in df.dtypes.items():
+        if col in percentage_columns:
+            formatters_map[col] = "{:,.2f} %".format
+        elif dtype == "float64":
+            formatters_map[col] = "{:,.2f}".format
+    if format_map:
+        for key in format_map:
+            formatters_map[key] = format_map[key]
+    return formatters_map
 
 
 def df_string(df, percentage_columns=(), format_map=None, **kwargs):
@@ -30,79 +236,845 @@ def df_string(df, percentage_columns=(), format_map=None, **kwargs):
     1    8    a
     2    5    b
     """
-    formatters_map = {}
-    for col, dtype in df.dtypes.iteritems():
-        if col in percentage_columns:
-            formatters_map[col] = "{:,.2f} %".format
-        elif dtype == "float64":
-            formatters_map[col] = "{:,.2f}".format
-    if format_map:
-        for key in format_map:
-            formatters_map[key] = format_map[key]
+    formatters_map = _df_string_formatters(df, percentage_columns, format_map)
+    if not kwargs:
+        # float columns are formatted as whole arrays, rather than by calling
+        # the formatters above on each cell, for identical output
+        fast_columns = _fast_columns(df, percentage_columns, format_map)
+        res = _fast_df_string(df, formatters_map, fast_columns)
+        if res is not None:
+            return res
     return df.to_string(formatters=formatters_map, **kwargs)
 
 
+def _rendered_widths(chunk, formatters, index=True, **kwargs):
+    """Returns the widths of the index and columns of a rendered chunk.
+
+    The chunk is rendered with a fence column of pipes prepended, and all
+    column labels replaced with pipes, so the right-justified labels mark
+    where each column ends in the header line.
+    """
+    fenced = chunk.copy(deep=False)
+    fenced.insert(
+        0,
+        "" if fenced.columns.nlevels == 1 else ("",) * fenced.columns.nlevels,
+        np.full(len(chunk), "|", dtype=object),
+        allow_duplicates=True,
+    )
+    header = fenced.to_string(
+        formatters=formatters,
+        header=["|"] * fenced.shape[1],
+        justify="right",
+        index=index,
+        **kwargs
+    ).split("\n", 1)[0]
+    edges = [len(header)]
+    for _ in range(fenced.shape[1] - 1):
+        edges.insert(0, header.rfind("|", 0, edges[0] - 1) + 1)
+    widths = [end - start - 1 for start, end in zip(edges, edges[1:])]
+    # with an index, the fence is rendered with a leading space
+    index_width = edges[0] - 3 if index else 0
+    return index_width, widths
+
+
+def _header_width(df, i, formatters):
+    """Returns the width of the rendered label of the given column."""
+    label = df.columns[i]
+    if not isinstance(label, tuple):
+        label = (label,)
+    width = max(len(str(level)) for level in label)
+    no_formatter = df.columns[i] not in formatters
+    if no_formatter and pd.api.types.is_numeric_dtype(df.dtypes.iloc[i]):
+        # pandas pads the labels of numeric columns to align signs
+        width += 1
+    return width
+
+
+def _pad_index(lines, index_width, widths):
+    """Pads the index part of the given rendered lines to the given width."""
+    columns_width = sum(widths) + len(widths)
+    return [
+        line[: len(line) - columns_width].ljust(index_width)
+        + line[len(line) - columns_width :]
+        for line in lines
+    ]
+
+
+def _level_widths(index):
+    """Returns the rendered width of the values of each level of the given
+    MultiIndex, without level names."""
+    return [
+        _rendered_widths(
+            pd.DataFrame(index=index.get_level_values(k)),
+            {},
+            index_names=False,
+        )[0]
+        for k in range(index.nlevels)
+    ]
+
+
+def _level_pads(index, signed_levels):
+    """Returns, for each level of the given MultiIndex, whether its values
+    must be prepended a space to align with negative values of other rows."""
+    return [
+        signed and not (index.get_level_values(k) < 0).any()
+        for k, signed in enumerate(signed_levels)
+    ]
+
+
+def _pad_levels(lines, columns_width, chunk_widths, widths, pads=None):
+    """Pads each level of the index part of the given rendered lines from its
+    width in the rendered chunk to the given width, optionally prepending a
+    space to align signs."""
+    padded = []
+    for line in lines:
+        index_part = line[: len(line) - columns_width]
+        parts = []
+        position = 0
+        for k, (chunk_width, width) in enumerate(zip(chunk_widths, widths)):
+            part = index_part[position : position + chunk_width]
+            if pads and pads[k]:  # an integer level, so without inner spaces
+                part = " " + part.rstrip()
+            parts.append(part.ljust(width))
+            position += chunk_width + 1
+        padded.append(" ".join(parts) + line[len(line) - columns_width :])
+    return padded
+
+
+def _rejustify(line, value_widths, widths, justify):
+    """Justifies each column of a rendered line from one width to another."""
+    columns_width = sum(value_widths) + len(value_widths)
+    position = len(line) - columns_width
+    # without an index, lines start with the first column
+    parts = [line[:position]] if position >= 0 else []
+    for value_width, width in zip(value_widths, widths):
+        value = line[position + 1 : position + 1 + value_width]
+        parts.append(_justify([value], width, justify)[0])
+        position += value_width + 1
+    return " ".join(parts)
+
+
+def _float_formatter(values, leading_space=True, na_rep="NaN"):
+    """Returns a formatter of floats, as pandas formats their whole column.
+
+    pandas trims trailing zeros equally from all values of a float column,
+    and switches to scientific notation if any of them is too small or too
+    long, so the format is determined by all values of the column.
+    """
+    digits = pd.get_option("display.precision")
+    space = " " if leading_space else ""
+    abs_vals = np.abs(values)
+    finite = values[np.isfinite(values)]
+    zeros = digits
+    width = 0
+    fixed = "{:" + space + "." + str(digits) + "f}"
+    for value in finite:
+        text = fixed.format(value)
+        zeros = min(zeros, len(text) - len(text.rstrip("0")))
+        width = max(width, len(text))
+    decimals = max(digits - zeros, 1) if len(finite) and digits else digits
+    widths = [width - digits + decimals]
+    if np.isinf(values).any():
+        widths.append(len(space + "-inf"))
+    if pd.isna(values).any():
+        widths.append(len(na_rep))
+    has_large = (abs_vals > 1e6).any()
+    has_small = ((abs_vals < 10 ** (-digits)) & (abs_vals > 0)).any()
+    if has_small or (max(widths) > digits + 6 and has_large):
+        return ("{:" + space + "." + str(digits) + "e}").format
+    return ("{:" + space + "." + str(decimals) + "f}").format
+
+
+def _datetime_string(value, dates_only, digits):
+    """Returns the string of a timestamp in a column of the given format."""
+    if pd.isna(value):
+        return "NaT"
+    if dates_only:
+        return value.strftime("%Y-%m-%d")
+    res = value.strftime("%Y-%m-%d %H:%M:%S")
+    if digits:
+        fraction = value.microsecond * 1000 + value.nanosecond
+        res += "." + "{:09d}".format(fraction)[:digits]
+    return res
+
+
+def _datetime_formatter(values):
+    """Returns a formatter of timestamps, as pandas formats their column."""
+    values = pd.Series(values).dropna()
+    dates_only = bool((values == values.dt.normalize()).all())
+    digits = 0
+    if (values.dt.nanosecond != 0).any():
+        digits = 9
+    elif (values.dt.microsecond % 1000 != 0).any():
+        digits = 6
+    elif (values.dt.microsecond != 0).any():
+        digits = 3
+    return functools.partial(
+        _datetime_string, dates_only=dates_only, digits=digits
+    )
+
+
+def _timedelta_string(value, even_days):
+    """Returns the string of a timedelta in a column of the given format."""
+    if pd.isna(value):
+        return "NaT"
+    if even_days:
+        return "{} days".format(value.days)
+    return str(value)
+
+
+def _timedelta_formatter(values):
+    """Returns a formatter of timedeltas, as pandas formats their column."""
+    values = pd.Series(values).dropna()
+    even_days = bool((values % pd.Timedelta(days=1) == pd.Timedelta(0)).all())
+    return functools.partial(_timedelta_string, even_days=even_days)
+
+
+def _column_formatters(df, formatters, leading_space=True, **kwargs):
+    """Returns formatters pinning the format of whole columns of a dataframe.
+
+    Columns without a formatter whose format pandas determines by all of
+    their values - floats other than float64, timestamps and timedeltas -
+    get a formatter reproducing the format of their whole column, so they
+    are formatted identically in all chunks of rows of the dataframe.
+    """
+    float_format = kwargs.get("float_format") or pd.get_option(
+        "display.float_format"
+    )
+    duplicated = df.columns.duplicated(keep=False)
+    pinned = {}
+    for i, (label, dtype) in enumerate(df.dtypes.items()):
+        if label in formatters or duplicated[i]:
+            continue
+        if not isinstance(dtype, np.dtype):
+            # extension dtypes are formatted value by value
+            continue
+        values = df.iloc[:, i].values
+        if dtype.kind == "f" and float_format is None:
+            pinned[label] = _float_formatter(
+                values, leading_space, kwargs.get("na_rep", "NaN")
+            )
+        elif dtype.kind == "M":
+            pinned[label] = _datetime_formatter(values)
+        elif dtype.kind == "m":
+            pinned[label] = _timedelta_formatter(values)
+    return pinned
+
+
+def _row_chunks(df, chunk_rows):
+    """Yields chunks of rows of a dataframe, for rendering one by one.
+
+    With a MultiIndex, chunks end only where the first index level changes,
+    so index labels sparsified by pandas are rendered as for the whole
+    dataframe; chunks larger than chunk_rows are yielded only for bigger
+    groups of rows sharing their first index level.
+    """
+    if not isinstance(df.index, pd.MultiIndex) or len(df) <= chunk_rows:
+        for chunk in sub_dfs_by_size(df, chunk_rows):
+            yield chunk
+        return
+    codes = np.asarray(df.index.codes[0])
+    starts = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+    start = 0
+    while start < len(df):
+        i = np.searchsorted(starts, start + chunk_rows, side="right")
+        if start + chunk_rows >= len(df):
+            end = len(df)
+        elif i > 0 and starts[i - 1] > start:
+            end = starts[i - 1]
+        elif i < len(starts):
+            end = starts[i]
+        else:
+            end = len(df)
+        yield df.iloc[start:end]
+        start = end
+
+
+def iter_df_string(
+    df, chunk_rows=10000, percentage_columns=(), format_map=None, **kwargs
+):
+    """Yields the rendering of the given dataframe by df_string, in chunks.
+
+    Rows are rendered chunk by chunk, so huge dataframes can be streamed to
+    files or network responses without building the whole string in memory.
+    The widths of the index and of all columns are computed in a pre-pass
+    over all chunks, so columns are aligned across chunks, and columns pandas
+    formats by all of their values are formatted as in the whole dataframe.
+
+    Arguments
+    ---------
+    df : pandas.DataFrame
+        A dataframe object.
+    chunk_rows : int, default 10000
+        The number of rows rendered in each chunk.
+    percentage_columns : iterable
+        A list of cloumn names to be displayed with a percentage sign.
+    format_map : dict, optional
+        Formatters of columns, overriding the default ones.
+    **kwargs
+        Additional keyword arguments are forwarded to DataFrame.to_string,
+        except col_space, which is set to the computed column widths.
+
+    Returns
+    -------
+    generator
+        A generator yielding the lines of each chunk of rows, ending with a
+        newline, with the header lines yielded with the first chunk.
+
+    Example
+    -------
+    >>> import pandas as pd
+    >>> df = pd.DataFrame({'num': [8, 12345, 5], 'char': ['a', 'b', 'cd']})
+    >>> for text in iter_df_string(df, chunk_rows=2): print(text, end='')
+         num char
+    0      8    a
+    1  12345    b
+    2      5   cd
+    """
+    if df.empty:
+        yield df_string(df, percentage_columns, format_map, **kwargs) + "\n"
+        return
+    formatters = _df_string_formatters(df, percentage_columns, format_map)
+    header = kwargs.pop("header", True)
+    justify = kwargs.pop("justify", None)
+    if justify is None:
+        justify = pd.get_option("display.colheader_justify")
+    index = kwargs.pop("index", True)
+    # pandas pads non-negative integers in the index to align signs
+    pad_signs = (
+        index
+        and pd.api.types.is_integer_dtype(df.index)
+        and not isinstance(df.index, pd.RangeIndex)
+        and (df.index < 0).any()
+    )
+    pinned = _column_formatters(df, formatters, index, **kwargs)
+    value_formatters = dict(formatters)
+    value_formatters.update(pinned)
+    # the levels of a multi-index are each padded to their own width
+    multi = index and isinstance(df.index, pd.MultiIndex)
+    if multi:
+        show_names = kwargs.get("index_names", True) and any(
+            name is not None for name in df.index.names
+        )
+        name_widths = [
+            len(str(name)) if show_names and name is not None else 0
+            for name in df.index.names
+        ]
+        signed_levels = [
+            pd.api.types.is_integer_dtype(level) and (level < 0).any()
+            for level in map(
+                df.index.get_level_values, range(df.index.nlevels)
+            )
+        ]
+        level_widths = list(name_widths)
+    measured = df
+    if not header:
+        # without a header, column names take no room in the index part
+        measured = df.copy(deep=False)
+        measured.columns = df.columns.set_names([None] * df.columns.nlevels)
+    index_width = 0
+    value_widths = [0] * df.shape[1]
+    for chunk in _row_chunks(measured, chunk_rows):
+        chunk_index_width, chunk_widths = _rendered_widths(
+            chunk, value_formatters, index=index, **kwargs
+        )
+        if pad_signs and not (chunk.index < 0).any():
+            chunk_index_width += 1
+        index_width = max(index_width, chunk_index_width)
+        value_widths = list(map(max, value_widths, chunk_widths))
+        if multi:
+            pads = _level_pads(chunk.index, signed_levels)
+            level_widths = [
+                max(width, chunk_width + pad)
+                for width, chunk_width, pad in zip(
+                    level_widths, _level_widths(chunk.index), pads
+                )
+            ]
+    if multi:
+        index_width = max(
+            index_width, sum(level_widths) + len(level_widths) - 1
+        )
+    widths = value_widths
+    if header:
+        widths = [
+            max(width, _header_width(df, i, formatters))
+            for i, width in enumerate(widths)
+        ]
+    columns_width = sum(widths) + len(widths)
+    for i, chunk in enumerate(_row_chunks(df, chunk_rows)):
+        lines = []
+        if i == 0:
+            # the header is rendered over a row with the pinned columns
+            # blanked, as their labels are rendered as without formatters
+            first = chunk.iloc[:1].copy()
+            for j, (label, dtype) in enumerate(df.dtypes.items()):
+                if label in pinned:
+                    first.iloc[:, j] = np.nan if dtype.kind == "f" else pd.NaT
+            lines = first.to_string(
+                formatters=formatters,
+                col_space=widths,
+                header=header,
+                justify=justify,
+                index=index,
+                **kwargs
+            ).split("\n")[:-1]
+            if multi and show_names:
+                first_widths = list(
+                    map(max, name_widths, _level_widths(first.index))
+                )
+                lines[-1:] = _pad_levels(
+                    lines[-1:], columns_width, first_widths, level_widths
+                )
+            lines = _pad_index(lines, index_width, widths)
+        # values are rendered right-justified to the widest value of their
+        # column, and then justified to the column width, as by to_string
+        values = chunk.to_string(
+            formatters=value_formatters,
+            col_space=value_widths,
+            header=False,
+            justify="right",
+            index=index,
+            **kwargs
+        ).split("\n")[-len(chunk) :]
+        if widths != value_widths:
+            values = [
+                _rejustify(line, value_widths, widths, justify)
+                for line in values
+            ]
+        if pad_signs and not (chunk.index < 0).any():
+            values = [" " + line for line in values]
+        if multi:
+            chunk_widths = list(
+                map(max, name_widths, _level_widths(chunk.index))
+            )
+            values = _pad_levels(
+                values,
+                columns_width,
+                chunk_widths,
+                level_widths,
+                _level_pads(chunk.index, signed_levels),
+            )
+        lines += _pad_index(values, index_width, widths)
+        yield "\n".join(lines) + "\n"
+
+
+def write_df_string(
+    df, fp, chunk_rows=10000, percentage_columns=(), format_map=None, **kwargs
+):
+    """Writes the rendering of the given dataframe by df_string to a file.
+
+    Rows are rendered and written chunk by chunk; see iter_df_string.
+
+    Arguments
+    ---------
+    df : pandas.DataFrame
+        A dataframe object.
+    fp : file-like object
+        A text file object to write to.
+    chunk_rows : int, default 10000
+        The number of rows rendered in each chunk.
+    percentage_columns : iterable
+        A list of cloumn names to be displayed with a percentage sign.
+    format_map : dict, optional
+        Formatters of columns, overriding the default ones.
+    **kwargs
+        Additional keyword arguments are forwarded to DataFrame.to_string.
+
+    Example
+    -------
+    >>> import io; import pandas as pd
+    >>> df = pd.DataFrame({'num': [8, 5], 'char': ['a', 'b']})
+    >>> fp = io.StringIO()
+    >>> write_df_string(df, fp, chunk_rows=1)
+    >>> print(fp.getvalue(), end='')
+       num char
+    0    8    a
+    1    5    b
+    """
+    for text in iter_df_string(
+        df, chunk_rows, percentage_columns, format_map, **kwargs
+    ):
+        fp.write(text)
+
+
+def _estimate_distinct(values, num_values):
+    """Returns an estimate of the number of distinct values of a column.
+
+    The bias-corrected Chao1 estimator is used: the number of distinct values
+    in a sample of the column is increased by a term growing with the number
+    of values seen once in the sample, and shrinking with the number of
+    values seen twice. The estimate is capped by the number of values.
+    """
+    frequencies = values.value_counts().value_counts()
+    singletons = frequencies.get(1, 0)
+    doubletons = frequencies.get(2, 0)
+    unseen = singletons * (singletons - 1) / (2 * (doubletons + 1))
+    return int(min(round(frequencies.sum() + unseen), num_values))
+
+
+def _column_summary(df, sample, quantiles):
+    """Returns a dataframe summarizing each column of the given dataframe."""
+    sampled = len(sample) < len(df)
+    nulls = df.isna().sum()
+    rows = []
+    for i, col in enumerate(df.columns):
+        values = sample.iloc[:, i]
+        dtype = df.dtypes.iloc[i]
+        row = [str(dtype), nulls.iloc[i]]
+        non_null = values.dropna()
+        try:
+            if not sampled:
+                row.append(non_null.nunique())
+            elif len(non_null):
+                num_non_null = len(df) - nulls.iloc[i]
+                row.append(_estimate_distinct(non_null, num_non_null))
+            else:
+                row.append(0)
+        except TypeError:  # unhashable values
+            row.append(np.nan)
+        numeric = pd.api.types.is_numeric_dtype(dtype)
+        if numeric and not pd.api.types.is_bool_dtype(dtype):
+            row.extend(non_null.astype(np.float64).quantile(quantiles))
+        else:
+            row.extend([np.nan] * len(quantiles))
+        rows.append(row)
+    columns = ["dtype", "nulls", "distinct"] + [
+        "{:g}%".format(q * 100) for q in quantiles
+    ]
+    return pd.DataFrame(rows, index=df.columns, columns=columns)
+
+
+def df_summary_string(
+    df,
+    num_rows=5,
+    sample_size=100000,
+    quantiles=(0.25, 0.5, 0.75),
+    random_state=None,
+):
+    """Returns a short summary string of the given dataframe.
+
+    The summary shows the first and last rows of the dataframe, followed by
+    the dtype, number of nulls, number of distinct values and quantiles of
+    each column. Null counts are exact, computed with vectorized reductions,
+    while distinct counts and quantiles are estimated from a uniform sample
+    of rows, so the summary takes bounded time regardless of the number of
+    rows. Distinct counts are estimated with the Chao1 estimator, and are
+    exact if all rows are sampled.
+
+    Arguments
+    ---------
+    df : pandas.DataFrame
+        A dataframe object.
+    num_rows : int, default 5
+        The number of first and of last rows to show.
+    sample_size : int, default 100000
+        The maximal number of rows sampled for distinct counts and quantiles.
+    quantiles : sequence of float, default (0.25, 0.5, 0.75)
+        The quantiles of numeric columns to show.
+    random_state : int or numpy.random.RandomState, optional
+        The seed or random state used for sampling.
+
+    Returns
+    -------
+    str
+        A short summary string of the given dataframe.
+
+    Example
+    -------
+    >>> import pandas as pd
+    >>> df = pd.DataFrame({'num': [8, 5, 3, None], 'count': [1, 1, 2, 1]})
+    >>> print(df_summary_string(df, num_rows=1))
+    4 rows x 2 columns
+       num  count
+    0 8.00      1
+    ...
+    3  NaN      1
+    <BLANKLINE>
+             dtype  nulls  distinct  25%  50%  75%
+    num    float64      1         3 4.00 5.00 6.50
+    count    int64      0         2 1.00 1.00 1.25
+    """
+    res = "{:,} rows x {:,} columns\n".format(len(df), df.shape[1])
+    if len(df) <= 2 * num_rows:
+        res += df_string(df)
+    elif num_rows == 0:
+        res += "..."
+    else:
+        shown = pd.concat([df.iloc[:num_rows], df.iloc[len(df) - num_rows :]])
+        lines = df_string(shown).split("\n")
+        header_lines = len(lines) - len(shown)
+        lines.insert(header_lines + num_rows, "...")
+        res += "\n".join(lines)
+    if len(df) > sample_size:
+        # sorted positions, sampled with replacement, keep memory bounded
+        positions = np.unique(
+            _random_state(random_state).randint(0, len(df), sample_size)
+        )
+        sample = df.iloc[positions]
+        res += "\n\nestimated from a sample of {:,} rows".format(len(sample))
+    else:
+        sample = df
+    summary = _column_summary(df, sample, list(quantiles))
+    return res + "\n\n" + df_string(summary)
+
+
+def _available_options(options):
+    """Returns the given (option, value) pairs known to installed pandas."""
+    available = []
+    for key, value in options:
+        try:
+            pd.get_option(key)
+        except KeyError:
+            continue
+        available.append((key, value))
+    return available
+
+
+# height and column_space were removed from later versions of pandas.
+_BIG_DATAFRAME_OPTIONS = _available_options(
+    [
+        ("display.max_colwidth", sys.maxsize),
+        ("display.height", sys.maxsize),
+        ("display.max_rows", sys.maxsize),
+        ("display.max_columns", sys.maxsize),
+        ("display.width", sys.maxsize),
+        ("display.colheader_justify", "center"),
+        ("display.column_space", sys.maxsize),
+        ("display.max_seq_items", sys.maxsize),
+        ("display.expand_frame_repr", True),
+    ]
+)
+
+
 def big_dataframe_setup():  # pragma: no cover
     """Sets pandas to display really big data frames."""
-    pd.set_option("display.max_colwidth", sys.maxsize)
-    pd.set_option("max_colwidth", sys.maxsize)
-    # height has been deprecated.
-    # pd.set_option('display.height', sys.maxsize)
-    pd.set_option("display.max_rows", sys.maxsize)
-    pd.set_option("display.max_columns", sys.maxsize)
-    pd.set_option("display.width", sys.maxsize)
-    pd.set_option("display.colheader_justify", "center")
-    pd.set_option("display.column_space", sys.maxsize)
-    pd.set_option("display.max_seq_items", sys.maxsize)
-    pd.set_option("display.expand_frame_repr", True)
+    for key, value in _BIG_DATAFRAME_OPTIONS:
+        pd.set_option(key, value)
+
+
+# pandas escapes these characters in object cells
+_full_object_string = functools.partial(
+    pprint_thing, escape_chars=("\t", "\r", "\n"), max_seq_items=sys.maxsize
+)
+
+
+def _full_object_formatters(df, formatters):
+    """Returns formatters rendering the object cells of a dataframe in full.
+
+    pandas truncates long object cells and sequences by the display options;
+    these formatters render them as with unbounded options, without setting
+    any, as pandas options are shared by all threads of the process.
+    """
+    duplicated = df.columns.duplicated(keep=False)
+    return {
+        label: _full_object_string
+        for i, (label, dtype) in enumerate(df.dtypes.items())
+        if label not in formatters
+        and not duplicated[i]
+        and (
+            pd.api.types.is_object_dtype(dtype)
+            or isinstance(dtype, pd.StringDtype)
+        )
+    }
+
+
+# pandas sets display.max_colwidth itself while rendering HTML, so threads
+# of the process render one at a time
+_TO_HTML_LOCK = threading.Lock()
+
+
+def _to_html(df, formatters):
+    """Returns the HTML code of a whole dataframe, with centered headers."""
+    with _TO_HTML_LOCK:
+        return df.to_html(
+            formatters=formatters,
+            justify="center",
+            max_rows=None,
+            max_cols=None,
+        )
 
 
 _PRECENT_WORDS = ["rate", "ratio", "percentage"]
 
 
-def _default_is_precentage_col(col_name):  # pragma: no cover
+def _default_is_precentage_col(col_name):
     return any([word in col_name.lower() for word in _PRECENT_WORDS])
 
 
-def _formatters_dict(input_df, percentage_columns=None):  # pragma: no cover
+@functools.lru_cache(maxsize=128)
+def _cached_formatters(columns, dtypes, percentage_columns):
     formatters = {}
     if percentage_columns is None:
         is_precentage_col = _default_is_precentage_col
     else:
         is_precentage_col = lambda col: col in percentage_columns  # noqa: E731
-    for col in input_df.columns:
+    for col, dtype in zip(columns, dtypes):
         if is_precentage_col(col):
             formatters[col] = "{:,.2f} %".format
-        elif input_df.dtypes[col] in [float, np.float64]:
+        elif dtype in [float, np.float64]:
             formatters[col] = "{:,.2f}".format
     return formatters
 
 
-def df_to_html(df, percentage_columns=None):  # pragma: no cover
+def _formatters_dict(input_df, percentage_columns=None):
+    # formatters only depend on the schema, so they are cached per schema
+    if percentage_columns is not None:
+        percentage_columns = tuple(percentage_columns)
+    return dict(
+        _cached_formatters(
+            tuple(input_df.columns), tuple(input_df.dtypes), percentage_columns
+        )
+    )
+
+
+def _html_table_parts(df, formatters):
+    """Returns the HTML code of a dataframe table before and after its rows."""
+    html = _to_html(df.iloc[:0], formatters)
+    head, _, tail = html.partition("<tbody>\n")
+    return head + "<tbody>\n", tail
+
+
+def _html_rows(chunk, formatters):
+    """Returns the HTML code of the table rows of the given dataframe."""
+    html = _to_html(chunk, formatters)
+    return html.partition("<tbody>\n")[2].rpartition("  </tbody>")[0]
+
+
+def df_to_html(df, percentage_columns=None, chunk_rows=None, executor=None):
     """Return a nicely formatted HTML code string for the given dataframe.
 
+    The global pandas display options are left unchanged, even temporarily;
+    all rows and columns are rendered, with object cells in full. Big
+    dataframes can be rendered in parallel, in chunks of rows whose table rows are stitched
+    together under a shared table header.
+
     Arguments
     ---------
     df : pandas.DataFrame
         A dataframe object.
     percentage_columns : iterable
         A list of cloumn names to be displayed with a percentage sign.
+    chunk_rows : int, optional
+        If given, rows are rendered in chunks of this size. Defaults to 10000
+        if an executor is given, and to rendering all rows at once otherwise.
+    executor : concurrent.futures.Executor, optional
+        The thread or process pool executor to render chunks of rows in. If
+        not given, chunks are rendered sequentially. The threads of a process
+        render one chunk at a time, so only process pools render in parallel.
 
     Returns
     -------
     str
         A nicely formatted string for the given dataframe.
+
+    Example
+    -------
+    >>> import pandas as pd
+    >>> df = pd.DataFrame({'success_rate': [0.5]})
+    >>> print(df_to_html(df))  # doctest: +NORMALIZE_WHITESPACE
+    <table border="1" class="dataframe">
+      <thead>
+        <tr style="text-align: center;">
+          <th></th>
+          <th>success_rate</th>
+        </tr>
+      </thead>
+      <tbody>
+        <tr>
+          <th>0</th>
+          <td>0.50 %</td>
+        </tr>
+      </tbody>
+    </table><br>
     """
-    big_dataframe_setup()
     try:
         res = "<br><h2> {} </h2>".format(df.name)
     except AttributeError:
         res = ""
-    df.style.set_properties(**{"text-align": "center"})
-    res += df.to_html(
-        formatters=_formatters_dict(
-            input_df=df, percentage_columns=percentage_columns
-        )
+    formatters = _formatters_dict(
+        input_df=df, percentage_columns=percentage_columns
     )
-    res += "<br>"
-    return res
+    formatters.update(_full_object_formatters(df, formatters))
+    if chunk_rows is None and executor is None:
+        return res + _to_html(df, formatters) + "<br>"
+    # chunks are formatted as the whole dataframe, and split between rows
+    # pandas does not sparsify together
+    formatters.update(_column_formatters(df, formatters))
+    chunks = _row_chunks(df, chunk_rows or 10000)
+    head, tail = _html_table_parts(df, formatters)
+    if executor is None:
+        rows = map(_html_rows, chunks, itertools.repeat(formatters))
+    else:
+        rows = executor.map(_html_rows, chunks, itertools.repeat(formatters))
+    res += head + "".join(rows) + tail
+    return res + "<br>"
+
+
+def iter_df_html(df, chunk_rows=10000, percentage_columns=None):
+    """Yields the HTML code of the given dataframe by df_to_html, in chunks.
+
+    Table rows are rendered chunk by chunk, so huge dataframes can be
+    streamed to files or network responses without building the whole HTML
+    code in memory. Formatters are determined once, for the whole dataframe,
+    so all columns are formatted as in a single rendering of it.
+
+    Arguments
+    ---------
+    df : pandas.DataFrame
+        A dataframe object.
+    chunk_rows : int, default 10000
+        The number of rows rendered in each chunk.
+    percentage_columns : iterable
+        A list of cloumn names to be displayed with a percentage sign.
+
+    Returns
+    -------
+    generator
+        A generator yielding the table header, the table rows of each chunk
+        and the end of the table, in HTML code.
+
+    Example
+    -------
+    >>> import pandas as pd
+    >>> df = pd.DataFrame({'num': [8, 5, 3]})
+    >>> parts = list(iter_df_html(df, chunk_rows=2))
+    >>> len(parts)
+    4
+    >>> print(parts[-1])
+      </tbody>
+    </table><br>
+    """
+    formatters = _formatters_dict(
+        input_df=df, percentage_columns=percentage_columns
+    )
+    try:
+        yield "<br><h2> {} </h2>".format(df.name)
+    except AttributeError:
+        pass
+    formatters.update(_full_object_formatters(df, formatters))
+    formatters.update(_column_formatters(df, formatters))
+    head, tail = _html_table_parts(df, formatters)
+    yield head
+    for chunk in _row_chunks(df, chunk_rows):
+        yield _html_rows(chunk, formatters)
+    yield tail + "<br>"
+
+
+def write_df_html(df, fp, chunk_rows=10000, percentage_columns=None):
+    """Writes the HTML code of the given dataframe by df_to_html to a file.
+
+    Table rows are rendered and written chunk by chunk; see iter_df_html.
+
+    Arguments
+    ---------
+    df : pandas.DataFrame
+        A dataframe object.
+    fp : file-like object
+        A text file object to write to.
+    chunk_rows : int, default 10000
+        The number of rows rendered in each chunk.
+    percentage_columns : iterable
+        A list of cloumn names to be displayed with a percentage sign.
+    """
+    for html in iter_df_html(df, chunk_rows, percentage_columns):
+        fp.write(html)
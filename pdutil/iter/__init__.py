@@ -1,10 +1,51 @@
 from .iter import (
     sub_dfs_by_size,
     sub_dfs_by_num,
+    sub_dfs_by_bytes,
+    sub_dfs_by_group,
+    sub_dfs_by_hash,
+    sub_dfs_by_time,
+    sliding_windows,
+    AdaptiveSubDfs,
+    iter_rows,
+    concat_chunks,
+)
+from .concurrency import (
+    prefetch,
+    async_chunks,
+    async_sub_dfs_by_size,
+    async_sub_dfs_by_num,
+    async_map,
+)
+from .instrument import (
+    instrumented,
+)
+from .checkpoint import (
+    run_resumable,
+)
+from .outofcore import (
+    external_sort,
+    merge_sorted,
+    chunked_groupby_agg,
+    chunked_join,
+    dedup_chunks,
+)
+from .sketch import (
+    HyperLogLog,
+    KLLSketch,
+    CountMinSketch,
+    BloomFilter,
+)
+from .sample import (
+    reservoir_sample,
+    stratified_sample,
 )
 
 
-for name in ['iter', 'name']:
+for name in [
+    'iter', 'concurrency', 'instrument', 'checkpoint', 'outofcore', 'sketch',
+    'sample', 'name',
+]:
     try:
         globals().pop(name)
     except KeyError:
@@ -0,0 +1,102 @@
+"""Checkpointed, resumable processing of pandas DataFrame chunks."""
+
+import json
+import os
+
+from pdutil.serial import SerializationFormat
+
+
+def _read_checkpoint(checkpoint_path):
+    """Returns the checkpoint dict at the given path, or None."""
+    try:
+        with open(checkpoint_path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_checkpoint(checkpoint_path, checkpoint):
+    """Atomically writes the given checkpoint dict to the given path."""
+    tmp_path = checkpoint_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, checkpoint_path)
+
+
+def run_resumable(
+    chunks, func, checkpoint_path, output_dir=None, serial_format="pickle"
+):
+    """Applies a function to each chunk, resuming after the last completed one.
+
+    A checkpoint recording the number of completed chunks is persisted after
+    each chunk. When re-run with the same checkpoint path, the chunks already
+    completed are skipped without being processed, so the given chunks must be
+    the same, in the same order, on every run - as with sub_dfs_by_size or
+    sub_dfs_by_num over the same dataframe. Delete the checkpoint file to
+    start over.
+
+    Arguments
+    ---------
+    chunks : iterable
+        The chunks to process, such as a generator of pdutil.iter.
+    func : callable
+        The function to apply to each chunk. If output_dir is given, it must
+        return a pandas.DataFrame.
+    checkpoint_path : str
+        The path of the checkpoint file.
+    output_dir : str, optional
+        If given, the dataframe returned by func for each chunk is persisted
+        into this directory, before the chunk is marked as completed.
+    serial_format : str or pdutil.serial.SerializationFormat, default 'pickle'
+        The serialization format to persist per-chunk outputs in.
+
+    Returns
+    -------
+    list or None
+        If output_dir is given, the paths of the persisted outputs of all
+        chunks, in order, including those completed in previous runs.
+        Otherwise None.
+
+    Example
+    -------
+    >>> import os, tempfile; import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'age': [23, 42, 15]})
+    >>> path = os.path.join(tempfile.mkdtemp(), 'ages.json')
+    >>> def process(subdf): print(list(subdf.age))
+    >>> pdutil.iter.run_resumable(
+    ...     pdutil.iter.sub_dfs_by_size(df, 2), process, path)
+    [23, 42]
+    [15]
+    >>> pdutil.iter.run_resumable(
+    ...     pdutil.iter.sub_dfs_by_size(df, 2), process, path)
+    """
+    if isinstance(serial_format, str):
+        serial_format = SerializationFormat.by_name(serial_format)
+    checkpoint = _read_checkpoint(checkpoint_path) or {
+        "completed_chunks": 0,
+        "completed_rows": 0,
+    }
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    output_paths = []
+    for i, chunk in enumerate(chunks):
+        if output_dir is not None:
+            output_paths.append(
+                os.path.join(
+                    output_dir,
+                    "chunk_{:06d}.{}".format(i, serial_format.ext),
+                )
+            )
+        if i < checkpoint["completed_chunks"]:
+            continue
+        res = func(chunk)
+        if output_dir is not None:
+            serial_format.serialize(res, output_paths[-1])
+        checkpoint["completed_chunks"] = i + 1
+        checkpoint["completed_rows"] += len(chunk)
+        _write_checkpoint(checkpoint_path, checkpoint)
+    if output_dir is not None:
+        return output_paths
+    return None
@@ -0,0 +1,296 @@
+"""Concurrent iteration over pandas DataFrames."""
+
+import asyncio
+import inspect
+import queue
+import threading
+
+from .iter import (
+    sub_dfs_by_size,
+    sub_dfs_by_num,
+)
+
+_DONE = object()
+
+
+def _running_loop():
+    """Returns the event loop running the current coroutine."""
+    try:
+        return asyncio.get_running_loop()
+    except AttributeError:  # Python < 3.7
+        return asyncio.get_event_loop()
+
+
+def prefetch(chunks, num=2):
+    """Get a generator yielding the given chunks, prefetched in the background.
+
+    A background thread consumes the given iterable, keeping up to num chunks
+    ready ahead of the consumer, so that producing the next chunks overlaps
+    with processing the current one. Exceptions raised while producing chunks
+    are re-raised to the consumer.
+
+    Arguments
+    ---------
+    chunks : iterable
+        Any iterable of chunks, such as the generators of pdutil.iter.
+    num : int, default 2
+        The maximum number of chunks to prefetch. Must be positive.
+
+    Returns
+    -------
+    generator
+        A generator yielding the given chunks, in order.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> data = [[23, "Jen"], [42, "Ray"], [15, "Fin"]]
+    >>> df = pd.DataFrame(data, columns=['age', 'name'])
+    >>> chunks = pdutil.iter.sub_dfs_by_size(df, 2)
+    >>> for subdf in pdutil.iter.prefetch(chunks): print(subdf)
+       age name
+    0   23  Jen
+    1   42  Ray
+       age name
+    2   15  Fin
+    """
+    if num < 1:
+        raise ValueError("num must be a positive integer.")
+    buffer = queue.Queue(maxsize=num)
+    stop = threading.Event()
+
+    def _put(item):
+        # never block for good, so an abandoned producer can exit
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce():
+        try:
+            for chunk in chunks:
+                if not _put((chunk, None)):
+                    return
+        except BaseException as error:  # re-raised in the consumer thread
+            _put((_DONE, error))
+            return
+        _put((_DONE, None))
+
+    producer = threading.Thread(target=_produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            chunk, error = buffer.get()
+            if chunk is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield chunk
+    finally:
+        stop.set()
+
+
+class _AsyncChunks(object):
+    """An asynchronous iterator producing the chunks of a synchronous iterable
+    in an executor."""
+
+    def __init__(self, chunks, executor=None):
+        self._chunks = iter(chunks)
+        self._executor = executor
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        loop = _running_loop()
+        chunk = await loop.run_in_executor(
+            self._executor, next, self._chunks, _DONE
+        )
+        if chunk is _DONE:
+            raise StopAsyncIteration
+        return chunk
+
+
+def async_chunks(chunks, executor=None):
+    """Get an asynchronous iterator over the chunks of the given iterable.
+
+    Each chunk is produced in an executor, so that slow producers, such as
+    file-backed readers, do not block the event loop.
+
+    Arguments
+    ---------
+    chunks : iterable
+        Any iterable of chunks, such as the generators of pdutil.iter, or the
+        reader returned by pandas.read_csv when given a chunksize.
+    executor : concurrent.futures.Executor, optional
+        The executor to produce chunks in. If not given, the default executor
+        of the event loop is used.
+
+    Returns
+    -------
+    asynchronous iterator
+        An asynchronous iterator yielding the given chunks, in order.
+
+    Example
+    -------
+    >>> import asyncio; import pdutil;
+    >>> async def total(chunks):
+    ...     res = 0
+    ...     async for chunk in pdutil.iter.async_chunks(chunks):
+    ...         res += chunk
+    ...     return res
+    >>> loop = asyncio.new_event_loop()
+    >>> loop.run_until_complete(total(range(5)))
+    10
+    >>> loop.close()
+    """
+    return _AsyncChunks(chunks, executor=executor)
+
+
+def async_sub_dfs_by_size(df, size, executor=None):
+    """Get an asynchronous iterator yielding consecutive sub-dataframes of the
+    given size.
+
+    Arguments
+    ---------
+    df : pandas.DataFrame
+        The dataframe for which to get sub-dataframes.
+    size : int
+        The size of each sub-dataframe.
+    executor : concurrent.futures.Executor, optional
+        The executor to produce sub-dataframes in. If not given, the default
+        executor of the event loop is used.
+
+    Returns
+    -------
+    asynchronous iterator
+        An asynchronous iterator yielding consecutive sub-dataframe of the
+        given size.
+
+    Example
+    -------
+    >>> import asyncio; import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame([[23, "Jen"], [42, "Ray"], [15, "Fin"]])
+    >>> async def sizes():
+    ...     res = []
+    ...     async for subdf in pdutil.iter.async_sub_dfs_by_size(df, 2):
+    ...         res.append(len(subdf))
+    ...     return res
+    >>> loop = asyncio.new_event_loop()
+    >>> loop.run_until_complete(sizes())
+    [2, 1]
+    >>> loop.close()
+    """
+    return _AsyncChunks(sub_dfs_by_size(df, size), executor=executor)
+
+
+def async_sub_dfs_by_num(df, num, executor=None, **kwargs):
+    """Get an asynchronous iterator yielding num consecutive sub-dataframes of
+    the given df.
+
+    Arguments
+    ---------
+    df : pandas.DataFrame
+        The dataframe for which to get sub-dataframes.
+    num : int
+        The number of sub-dataframe to divide the given dataframe into.
+    executor : concurrent.futures.Executor, optional
+        The executor to produce sub-dataframes in. If not given, the default
+        executor of the event loop is used.
+    **kwargs
+        Additional keyword arguments are forwarded to sub_dfs_by_num.
+
+    Returns
+    -------
+    asynchronous iterator
+        An asynchronous iterator yielding n consecutive sub-dataframes of the
+        given df.
+
+    Example
+    -------
+    >>> import asyncio; import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame([[23, "Jen"], [42, "Ray"], [15, "Fin"]])
+    >>> async def sizes():
+    ...     res = []
+    ...     async for subdf in pdutil.iter.async_sub_dfs_by_num(df, 2):
+    ...         res.append(len(subdf))
+    ...     return res
+    >>> loop = asyncio.new_event_loop()
+    >>> loop.run_until_complete(sizes())
+    [2, 1]
+    >>> loop.close()
+    """
+    return _AsyncChunks(sub_dfs_by_num(df, num, **kwargs), executor=executor)
+
+
+async def async_map(func, chunks, concurrency=4, executor=None):
+    """Applies the given function to each chunk, with bounded parallelism.
+
+    No more than concurrency chunks are processed, or held waiting to be
+    processed, at any moment; the next chunk is only produced once a previous
+    one is done.
+
+    Arguments
+    ---------
+    func : callable
+        A coroutine function, or a regular function, to apply to each chunk.
+        Regular functions are run in an executor.
+    chunks : iterable or asynchronous iterable
+        The chunks to process. Synchronous iterables are consumed in an
+        executor, as by async_chunks.
+    concurrency : int, default 4
+        The maximum number of chunks to process concurrently.
+    executor : concurrent.futures.Executor, optional
+        The executor to run regular functions and produce chunks in. If not
+        given, the default executor of the event loop is used.
+
+    Returns
+    -------
+    list
+        The results of applying func to each chunk, in the order of chunks.
+
+    Example
+    -------
+    >>> import asyncio; import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'age': [23, 42, 15]})
+    >>> async def upload(subdf):
+    ...     await asyncio.sleep(0)
+    ...     return subdf.age.sum()
+    >>> chunks = pdutil.iter.async_sub_dfs_by_size(df, 2)
+    >>> loop = asyncio.new_event_loop()
+    >>> res = loop.run_until_complete(pdutil.iter.async_map(upload, chunks))
+    >>> [int(x) for x in res]
+    [65, 15]
+    >>> loop.close()
+    """
+    loop = _running_loop()
+    if not hasattr(chunks, "__aiter__"):
+        chunks = _AsyncChunks(chunks, executor=executor)
+    chunks = chunks.__aiter__()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _process(chunk):
+        try:
+            if inspect.iscoroutinefunction(func):
+                return await func(chunk)
+            return await loop.run_in_executor(executor, func, chunk)
+        finally:
+            semaphore.release()
+
+    tasks = []
+    try:
+        while True:
+            await semaphore.acquire()
+            try:
+                chunk = await chunks.__anext__()
+            except StopAsyncIteration:
+                break
+            tasks.append(asyncio.ensure_future(_process(chunk)))
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
@@ -0,0 +1,159 @@
+"""Instrumentation of iteration over pandas DataFrames."""
+
+import logging
+import time
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+_PERCENTILES = (50, 90, 99)
+
+
+def _chunk_size(chunk):
+    """Returns the number of rows and of bytes of the given chunk.
+
+    Chunks without a length, such as scalars, are counted as a single row.
+    """
+    try:
+        nbytes = chunk.memory_usage(index=True, deep=False)
+    except AttributeError:  # not a pandas object
+        try:
+            num_rows = len(chunk)
+        except TypeError:  # unsized
+            num_rows = 1
+        return num_rows, getattr(chunk, "nbytes", 0)
+    try:
+        nbytes = nbytes.sum()
+    except AttributeError:  # a pandas.Series
+        pass
+    return len(chunk), int(nbytes)
+
+
+def _stats(name, num_rows, num_bytes, produce_times, consume_times):
+    """Returns a dict of statistics over the given per-chunk measurements."""
+    produce_seconds = float(np.sum(produce_times))
+    consume_seconds = float(np.sum(consume_times))
+    total_seconds = produce_seconds + consume_seconds
+    stats = {
+        "name": name,
+        "chunks": len(consume_times),
+        "rows": num_rows,
+        "bytes": num_bytes,
+        "produce_seconds": produce_seconds,
+        "consume_seconds": consume_seconds,
+        "total_seconds": total_seconds,
+        "rows_per_second": num_rows / total_seconds if total_seconds else 0,
+        "bytes_per_second": num_bytes / total_seconds if total_seconds else 0,
+    }
+    latencies = np.add(produce_times, consume_times)
+    for percentile in _PERCENTILES:
+        stats["latency_p{}".format(percentile)] = (
+            float(np.percentile(latencies, percentile))
+            if len(latencies)
+            else 0
+        )
+    return stats
+
+
+def _log_stats(stats):
+    """Logs the given statistics dict."""
+    LOGGER.info(
+        "%s: %d chunks, %d rows, %d bytes in %.3fs (%.3fs producing, %.3fs "
+        "consuming); %.1f rows/s, %.1f bytes/s; chunk latency p50 %.4fs, p90 "
+        "%.4fs, p99 %.4fs",
+        stats["name"],
+        stats["chunks"],
+        stats["rows"],
+        stats["bytes"],
+        stats["total_seconds"],
+        stats["produce_seconds"],
+        stats["consume_seconds"],
+        stats["rows_per_second"],
+        stats["bytes_per_second"],
+        stats["latency_p50"],
+        stats["latency_p90"],
+        stats["latency_p99"],
+    )
+
+
+def instrumented(chunks, callback=None, name="chunks", report_every=None):
+    """Get a generator yielding the given chunks while measuring throughput.
+
+    The time spent producing each chunk (i.e. inside the wrapped iterable) and
+    consuming it (i.e. until the next chunk is requested) is measured, and a
+    dict of statistics is reported when iteration ends or is abandoned,
+    unless already reported for all chunks, and, optionally, every
+    report_every chunks. Statistics include the keys name,
+    chunks, rows, bytes, produce_seconds, consume_seconds, total_seconds,
+    rows_per_second, bytes_per_second, latency_p50, latency_p90 and
+    latency_p99, where latency is the produce and consume time of a chunk.
+
+    Arguments
+    ---------
+    chunks : iterable
+        Any iterable of chunks, such as the generators of pdutil.iter. Chunks
+        without a length are counted as a single row each.
+    callback : callable, optional
+        A function to call with each statistics dict. If not given,
+        statistics are logged, at the INFO level, by the pdutil.iter.instrument
+        logger.
+    name : str, default 'chunks'
+        A name identifying this iteration in reported statistics.
+    report_every : int, optional
+        If given, statistics of all chunks so far are also reported every
+        this many chunks.
+
+    Returns
+    -------
+    generator
+        A generator yielding the given chunks, in order.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'age': [23, 42, 15]})
+    >>> reports = []
+    >>> chunks = pdutil.iter.sub_dfs_by_size(df, 2)
+    >>> for subdf in pdutil.iter.instrumented(chunks, reports.append):
+    ...     pass
+    >>> reports[0]['chunks'], reports[0]['rows']
+    (2, 3)
+    """
+    if callback is None:
+        callback = _log_stats
+    num_rows = 0
+    num_bytes = 0
+    produce_times = []
+    consume_times = []
+    reported = None
+    iterator = iter(chunks)
+    try:
+        while True:
+            tic = time.perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                break
+            produced = time.perf_counter()
+            produce_times.append(produced - tic)
+            chunk_rows, chunk_bytes = _chunk_size(chunk)
+            num_rows += chunk_rows
+            num_bytes += chunk_bytes
+            try:
+                yield chunk
+            finally:
+                consume_times.append(time.perf_counter() - produced)
+            if report_every and len(consume_times) % report_every == 0:
+                callback(
+                    _stats(
+                        name, num_rows, num_bytes, produce_times, consume_times
+                    )
+                )
+                reported = len(consume_times)
+    finally:
+        # the last periodic report already holds the final statistics
+        if reported != len(consume_times):
+            callback(
+                _stats(name, num_rows, num_bytes, produce_times, consume_times)
+            )
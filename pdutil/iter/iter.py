@@ -1,5 +1,15 @@
 """Iteration over pandas DataFrames."""
 
+import functools
+import heapq
+import itertools
+import keyword
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
 
 def sub_dfs_by_size(df, size):
     """Get a generator yielding consecutive sub-dataframes of the given size.
@@ -32,15 +42,27 @@ def sub_dfs_by_size(df, size):
         yield (df.iloc[i : i + size])
 
 
-def sub_dfs_by_num(df, num):
+def sub_dfs_by_num(df, num, weights=None, contiguous=True):
     """Get a generator yielding num consecutive sub-dataframes of the given df.
 
+    If weights are given, the sub-dataframes are of near-equal total weight,
+    rather than of near-equal size.
+
     Arguments
     ---------
     df : pandas.DataFrame
         The dataframe for which to get sub-dataframes.
     num : int
         The number of sub-dataframe to divide the given dataframe into.
+    weights : object or array-like, optional
+        The label of a column holding the weight (e.g. processing cost) of
+        each row, or an array of such per-row weights. Weights must be
+        non-negative.
+    contiguous : bool, default True
+        If set to False, rows are not kept in consecutive sub-dataframes, but
+        are greedily packed, heaviest first, into the lightest sub-dataframe
+        so far. This balances weights better when a few rows are very heavy.
+        Rows keep their original order inside each sub-dataframe.
 
     Returns
     -------
@@ -58,7 +80,924 @@ def sub_dfs_by_num(df, num):
     1   42  Ray
        age name
     2   15  Fin
+    >>> for subdf in pdutil.iter.sub_dfs_by_num(df, 2, weights='age'):
+    ...     print(subdf)
+       age name
+    0   23  Jen
+       age name
+    1   42  Ray
+    2   15  Fin
+    """
+    if weights is None and contiguous:
+        size = len(df) / float(num)
+        for i in range(num):
+            yield df.iloc[int(round(size * i)) : int(round(size * (i + 1)))]
+        return
+    row_weights = _row_weights(df, weights)
+    if not row_weights.any():
+        # nothing to balance; fall back to near-equal sizes
+        row_weights = np.ones(len(row_weights))
+    if contiguous:
+        bounds = _weighted_bounds(row_weights, num)
+        for i in range(num):
+            yield df.iloc[bounds[i] : bounds[i + 1]]
+        return
+    bins = _greedy_bins(row_weights, num)
+    positions = np.argsort(bins, kind="mergesort")
+    bounds = np.append(0, np.cumsum(np.bincount(bins, minlength=num)))
+    for i in range(num):
+        yield df.iloc[positions[bounds[i] : bounds[i + 1]]]
+
+
+def _row_weights(df, weights):
+    """Returns an array of per-row weights by a column label or an array."""
+    try:
+        in_columns = weights in df.columns
+    except TypeError:  # unhashable, e.g. a list or a numpy array
+        in_columns = False
+    if in_columns:
+        row_weights = df[weights].values
+    else:
+        row_weights = np.asarray(weights)
+    row_weights = row_weights.astype(np.float64)
+    if row_weights.shape != (len(df),):
+        raise ValueError("There must be exactly one weight per row.")
+    if not (row_weights >= 0).all():
+        raise ValueError("Weights must be non-negative numbers.")
+    return row_weights
+
+
+def _weighted_bounds(row_weights, num):
+    """Returns num + 1 positions cutting the given weights into num contiguous
+    parts of near-equal total weight."""
+    if len(row_weights) == 0:
+        return np.zeros(num + 1, dtype=np.int64)
+    cum_weights = np.cumsum(row_weights)
+    total = cum_weights[-1]
+    targets = total * np.arange(1, num) / num
+    # the first row at which the cumulative weight reaches each target
+    ends = np.searchsorted(cum_weights, targets, "left")
+    ends = np.minimum(ends, len(cum_weights) - 1)
+    before = np.where(ends > 0, cum_weights[ends - 1], 0.0)
+    # cut after that row only if it gets us closer to the target
+    ends = ends + (cum_weights[ends] - targets <= targets - before)
+    ends = np.maximum.accumulate(ends)
+    return np.concatenate(([0], ends, [len(row_weights)])).astype(np.int64)
+
+
+def _greedy_bins(row_weights, num):
+    """Assigns each row to one of num bins, heaviest row first, always to the
+    currently lightest bin."""
+    bins = np.empty(len(row_weights), dtype=np.int64)
+    loads = [(0.0, i) for i in range(num)]
+    for position in np.argsort(-row_weights, kind="mergesort"):
+        load, i = loads[0]
+        bins[position] = i
+        heapq.heapreplace(loads, (load + row_weights[position], i))
+    return bins
+
+
+def _random_state(seed=None):
+    """Returns a numpy.random.RandomState object by the given seed."""
+    if isinstance(seed, np.random.RandomState):
+        return seed
+    return np.random.RandomState(seed)
+
+
+def _row_bytes(df, sample_size=None, random_state=None):
+    """Returns an estimate of the memory used by each row of the given df.
+
+    Columns of the object dtype are measured deeply, element by element, or,
+    if sample_size is given, by the average element size in a random sample
+    of that many rows. String extension columns are distributed by string
+    length. All other columns, as well as the index, contribute their memory
+    usage evenly to all rows.
+    """
+    num_rows = len(df)
+    if num_rows == 0:
+        return np.zeros(0, dtype=np.float64)
+    row_bytes = np.full(
+        num_rows, df.index.memory_usage(deep=True) / num_rows, np.float64
+    )
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        if col.dtype != object:
+            col_bytes = col.memory_usage(index=False, deep=True)
+            if pd.api.types.is_string_dtype(col.dtype):
+                # string extension arrays: distribute by string length
+                lengths = col.str.len().fillna(0).values.astype(np.float64)
+                row_bytes += lengths
+                col_bytes -= lengths.sum()
+            row_bytes += col_bytes / num_rows
+            continue
+        values = col.values
+        row_bytes += values.itemsize
+        if sample_size is None or sample_size >= num_rows:
+            row_bytes += np.fromiter(
+                map(sys.getsizeof, values), np.float64, num_rows
+            )
+        else:
+            positions = _random_state(random_state).randint(
+                0, num_rows, sample_size
+            )
+            row_bytes += np.mean([sys.getsizeof(x) for x in values[positions]])
+    return row_bytes
+
+
+def sub_dfs_by_bytes(df, max_bytes, sample_size=None, random_state=None):
+    """Get a generator yielding consecutive sub-dataframes of bounded memory.
+
+    The memory used by each row is estimated deeply, so rows holding long
+    strings or nested objects weigh more than others. A row estimated to
+    take more than max_bytes by itself is yielded as a single-row
+    sub-dataframe.
+
+    Arguments
+    ---------
+    df : pandas.DataFrame
+        The dataframe for which to get sub-dataframes.
+    max_bytes : int
+        The maximum estimated memory, in bytes, of each sub-dataframe.
+    sample_size : int, optional
+        If given, the memory used by object columns is estimated from a random
+        sample of this many rows instead of from all rows. Faster, but the
+        memory budget is then respected only approximately.
+    random_state : int or numpy.random.RandomState, optional
+        The seed or random state used for sampling rows.
+
+    Returns
+    -------
+    generator
+        A generator yielding consecutive sub-dataframes, each estimated to
+        take at most max_bytes of memory.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'txt': ['a' * 1000, 'b', 'c', 'd', 'e' * 1000]})
+    >>> for subdf in pdutil.iter.sub_dfs_by_bytes(df, 1500):
+    ...     print(list(subdf.index))
+    [0, 1, 2, 3]
+    [4]
+    """
+    row_bytes = _row_bytes(
+        df, sample_size=sample_size, random_state=random_state
+    )
+    cum_bytes = np.cumsum(row_bytes)
+    start = 0
+    consumed = 0.0
+    while start < len(df):
+        end = int(np.searchsorted(cum_bytes, consumed + max_bytes, "right"))
+        end = max(end, start + 1)
+        yield df.iloc[start:end]
+        consumed = cum_bytes[end - 1]
+        start = end
+
+
+def _key_codes(df, key):
+    """Returns integer codes identifying the value of key in each row.
+
+    Codes are assigned in order of first appearance, with missing values
+    treated as a value of their own. Key can be a single column label or a
+    list of column labels.
+    """
+    return df.groupby(key, sort=False, dropna=False).ngroup().values
+
+
+def sub_dfs_by_group(df, key, target_size):
+    """Get a generator yielding sub-dataframes never splitting a key value.
+
+    Each sub-dataframe is made of roughly target_size rows, and all rows
+    sharing a value of key are yielded in the same sub-dataframe. If rows with
+    equal key values are not already contiguous in the given dataframe, they
+    are brought together, in order of their first appearance.
+
+    Arguments
+    ---------
+    df : pandas.DataFrame
+        The dataframe for which to get sub-dataframes.
+    key : object or list
+        The label, or list of labels, of the column(s) to group rows by.
+    target_size : int
+        The desired, positive, number of rows in each sub-dataframe.
+
+    Returns
+    -------
+    generator
+        A generator yielding sub-dataframes, each holding all the rows of one
+        or more values of key.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> data = [[1, "Jen"], [1, "Ray"], [2, "Fin"], [3, "Kim"], [3, "Sam"]]
+    >>> df = pd.DataFrame(data, columns=['team', 'name'])
+    >>> for subdf in pdutil.iter.sub_dfs_by_group(df, 'team', 2): print(subdf)
+       team name
+    0     1  Jen
+    1     1  Ray
+       team name
+    2     2  Fin
+    3     3  Kim
+    4     3  Sam
+    """
+    if target_size < 1:
+        raise ValueError("target_size must be a positive integer.")
+    if len(df) == 0:
+        return
+    codes = _key_codes(df, key)
+    group_starts = np.flatnonzero(np.diff(codes)) + 1
+    if len(group_starts) + 1 == codes.max() + 1:
+        order = None
+    else:
+        order = np.argsort(codes, kind="mergesort")
+        group_starts = np.flatnonzero(np.diff(codes[order])) + 1
+    bounds = np.append(group_starts, len(df))
+    start = 0
+    while start < len(df):
+        i = int(np.searchsorted(bounds, start + target_size, "left"))
+        i = min(i, len(bounds) - 1)
+        end = int(bounds[i])
+        if i > 0 and bounds[i - 1] > start:
+            before = int(bounds[i - 1])
+            if start + target_size - before < end - start - target_size:
+                end = before
+        if order is None:
+            yield df.iloc[start:end]
+        else:
+            yield df.iloc[order[start:end]]
+        start = end
+
+
+def _canonical_series(series):
+    """Returns the given series with numeric values cast to float64."""
+    if getattr(series.dtype, "kind", None) in ("i", "u", "f"):
+        # adding 0.0 also turns negative zeros into zeros
+        return series.astype(np.float64) + 0.0
+    return series
+
+
+def _hash_values(values, hash_key=None):
+    """Returns the 64-bit hashes of the rows of a series or a dataframe.
+
+    Numeric values are hashed as float64, so equal values hash the same in
+    chunks of different dtypes, e.g. where missing values made an integer
+    column a float one.
+    """
+    if isinstance(values, pd.DataFrame):
+        values = pd.concat(
+            [
+                _canonical_series(values.iloc[:, i])
+                for i in range(values.shape[1])
+            ],
+            axis=1,
+        )
+    else:
+        values = _canonical_series(values)
+    kwargs = {} if hash_key is None else {"hash_key": hash_key}
+    return pd.util.hash_pandas_object(values, index=False, **kwargs).values
+
+
+def _hash_buckets(df, keys, num):
+    """Returns the bucket, out of num, of the key value of each row."""
+    if isinstance(keys, list) and len(keys) == 1:
+        keys = keys[0]
+    hashes = _hash_values(df[keys])
+    return (hashes % np.uint64(num)).astype(np.int64)
+
+
+def sub_dfs_by_hash(df, keys, num):
+    """Get a generator yielding num sub-dataframes partitioned by key hash.
+
+    All rows with equal values of the given key columns are yielded in the
+    same sub-dataframe, and equal key values of two different dataframes of
+    the same key dtypes fall in sub-dataframes of the same ordinal. Numeric
+    keys are compared by value, so integer and float keys also do. Rows keep
+    their original order inside each sub-dataframe.
+
+    Arguments
+    ---------
+    df : pandas.DataFrame
+        The dataframe for which to get sub-dataframes.
+    keys : object or list
+        The label, or list of labels, of the column(s) to partition rows by.
+    num : int
+        The number of sub-dataframe to divide the given dataframe into.
+
+    Returns
+    -------
+    generator
+        A generator yielding num sub-dataframes, some of which may be empty.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'user': [1, 2, 1, 3, 2], 'val': range(5)})
+    >>> for subdf in pdutil.iter.sub_dfs_by_hash(df, 'user', 2):
+    ...     print(sorted(set(subdf.user)))
+    [1]
+    [2, 3]
     """
-    size = len(df) / float(num)
+    buckets = _hash_buckets(df, keys, num)
+    positions = np.argsort(buckets, kind="mergesort")
+    bounds = np.append(0, np.cumsum(np.bincount(buckets, minlength=num)))
     for i in range(num):
-        yield df.iloc[int(round(size * i)) : int(round(size * (i + 1)))]
+        yield df.iloc[positions[bounds[i] : bounds[i + 1]]]
+
+
+def _windows_view(values, window, step):
+    """Returns a read-only strided view of all row windows of a 2d array."""
+    num_windows = max(0, (len(values) - window) // step + 1)
+    if num_windows == 0:
+        return np.empty((0, window, values.shape[1]), dtype=values.dtype)
+    try:
+        view = np.lib.stride_tricks.sliding_window_view(values, window, 0)
+        return view[::step].transpose(0, 2, 1)
+    except AttributeError:  # numpy under 1.20
+        row_stride, col_stride = values.strides
+        return np.lib.stride_tricks.as_strided(
+            values,
+            shape=(num_windows, window, values.shape[1]),
+            strides=(row_stride * step, row_stride, col_stride),
+            writeable=False,
+        )
+
+
+def _window_slices(df, window, step):
+    """Yields the sub-dataframe of each row window of the given df."""
+    for i in range(0, len(df) - window + 1, step):
+        yield df.iloc[i : i + window]
+
+
+def sliding_windows(df, window, step=1, as_array=False):
+    """Get all, possibly overlapping, windows of consecutive rows of a df.
+
+    Arguments
+    ---------
+    df : pandas.DataFrame
+        The dataframe for which to get windows.
+    window : int
+        The number of rows in each window.
+    step : int, default 1
+        The number of rows between the starts of consecutive windows.
+    as_array : bool, default False
+        If set to True, a single read-only strided numpy view of the numeric
+        columns of the given dataframe is returned, instead of a generator of
+        sub-dataframes. No data is copied for each window, making this much
+        faster over many overlapping windows.
+
+    Returns
+    -------
+    generator or numpy.ndarray
+        A generator yielding the sub-dataframe of each window or, if as_array
+        is set, an array of shape (num_windows, window, num_numeric_columns).
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'x': [1, 2, 3, 4], 'c': list('abcd')})
+    >>> for subdf in pdutil.iter.sliding_windows(df, 3): print(subdf)
+       x  c
+    0  1  a
+    1  2  b
+    2  3  c
+       x  c
+    1  2  b
+    2  3  c
+    3  4  d
+    >>> pdutil.iter.sliding_windows(df, 2, step=2, as_array=True)[:, :, 0]
+    array([[1, 2],
+           [3, 4]])
+    """
+    if window < 1 or step < 1:
+        raise ValueError("Both window and step must be positive integers.")
+    if as_array:
+        values = df.select_dtypes(include=[np.number]).values
+        return _windows_view(values, window, step)
+    return _window_slices(df, window, step)
+
+
+def _is_end_anchored(offset):
+    """Returns whether periods of the given offset end, rather than start, at
+    its dates, as with month ends or weeks ending on a given weekday."""
+    if isinstance(offset, pd.offsets.Week):
+        return offset.weekday is not None
+    return isinstance(
+        offset,
+        (
+            pd.offsets.MonthEnd,
+            pd.offsets.QuarterEnd,
+            pd.offsets.YearEnd,
+            pd.offsets.BusinessMonthEnd,
+            pd.offsets.BQuarterEnd,
+            pd.offsets.BYearEnd,
+        ),
+    )
+
+
+def sub_dfs_by_time(df, freq, on=None):
+    """Get a generator yielding consecutive sub-dataframes per time bucket.
+
+    The given dataframe must be sorted by time. Empty time buckets are
+    skipped. As with pandas.DataFrame.resample, buckets of end-anchored
+    frequencies, such as 'ME' or 'W', are the whole periods ending at their
+    dates, so 'ME' buckets are calendar months.
+
+    Arguments
+    ---------
+    df : pandas.DataFrame
+        The dataframe for which to get sub-dataframes.
+    freq : str or pandas.DateOffset
+        The frequency of time buckets, e.g. 'h', 'D', '15min' or 'MS'.
+    on : object, optional
+        The label of the datetime column to bucket rows by. If not given, the
+        dataframe must be indexed by a pandas.DatetimeIndex.
+
+    Returns
+    -------
+    generator
+        A generator yielding consecutive sub-dataframes, each holding all the
+        rows of one time bucket.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> times = pd.to_datetime(['2019-01-01 10:00', '2019-01-01 17:00',
+    ...                         '2019-01-03 09:00'])
+    >>> df = pd.DataFrame({'price': [10, 12, 9]}, index=times)
+    >>> for subdf in pdutil.iter.sub_dfs_by_time(df, 'D'): print(subdf)
+                         price
+    2019-01-01 10:00:00     10
+    2019-01-01 17:00:00     12
+                         price
+    2019-01-03 09:00:00      9
+    """
+    if on is None:
+        times = df.index
+        if not isinstance(times, pd.DatetimeIndex):
+            raise TypeError(
+                "Either give the label of a datetime column as on, or use a "
+                "pandas.DatetimeIndex."
+            )
+    else:
+        times = pd.DatetimeIndex(df[on])
+    if len(times) == 0:
+        return
+    if not times.is_monotonic_increasing:
+        raise ValueError("The given dataframe must be sorted by time.")
+    offset = pd.tseries.frequencies.to_offset(freq)
+    if _is_end_anchored(offset):
+        # each bucket starts the day after an anchor date
+        day = pd.Timedelta(days=1)
+        first = offset.rollback(times[0].normalize() - day)
+        edges = pd.date_range(first, times[-1], freq=offset) + day
+    else:
+        try:
+            first = times[0].floor(offset)
+        except ValueError:  # not a fixed frequency, e.g. month start
+            first = offset.rollback(times[0].normalize())
+        edges = pd.date_range(first, times[-1], freq=offset)
+    bounds = np.concatenate(
+        ([0], times.searchsorted(edges[1:], "left"), [len(times)])
+    )
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if end > start:
+            yield df.iloc[start:end]
+
+
+class AdaptiveSubDfs(object):
+    """An iterable over consecutive sub-dataframes of adaptively tuned size.
+
+    The time it takes to process each yielded sub-dataframe - that is, the
+    time until the next one is requested - is measured, and the size of the
+    following sub-dataframes is grown or shrunk, by hill climbing, towards
+    the size processed at the most rows per second. The rate of each size is
+    the median rate of several of its sub-dataframes, so a single noisy
+    measurement does not steer the size. The size is changed in smaller steps
+    each time the direction of change reverses, until it settles.
+
+    Arguments
+    ---------
+    df : pandas.DataFrame
+        The dataframe for which to get sub-dataframes.
+    size : int, default 1000
+        The size of the first sub-dataframe.
+    min_size : int, default 1
+        The minimal size of sub-dataframes.
+    max_size : int, optional
+        The maximal size of sub-dataframes.
+    max_bytes : int, optional
+        If given, sub-dataframes are also limited to the number of rows
+        estimated to take this much memory, on average.
+    factor : float, default 2
+        The initial factor by which the size is grown or shrunk.
+    samples : int, default 3
+        The number of sub-dataframes of each size measured before the size is
+        changed.
+    timer : callable, default time.perf_counter
+        A function returning the current time, in seconds.
+
+    Attributes
+    ----------
+    size : int
+        The size of the next sub-dataframe to yield.
+    best_size : int
+        The size processed at the highest median rows per second so far. Can
+        be used to pin the size of later iterations, e.g. with
+        sub_dfs_by_size.
+    history : list
+        A (size, rows_per_second) tuple for each processed sub-dataframe.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'val': range(100)})
+    >>> sub_dfs = pdutil.iter.AdaptiveSubDfs(df, size=10, max_size=40)
+    >>> sizes = [len(subdf) for subdf in sub_dfs]
+    >>> sizes[:4]
+    [10, 10, 10, 20]
+    >>> sum(sizes)
+    100
+    """
+
+    _MIN_FACTOR = 1.05
+
+    def __init__(
+        self,
+        df,
+        size=1000,
+        min_size=1,
+        max_size=None,
+        max_bytes=None,
+        factor=2.0,
+        samples=3,
+        timer=time.perf_counter,
+    ):
+        self.df = df
+        self.min_size = max(1, min_size)
+        self.max_size = max_size or max(len(df), self.min_size)
+        if max_bytes is not None and len(df) > 0:
+            mean_row_bytes = _row_bytes(df, sample_size=1000).mean()
+            self.max_size = min(
+                self.max_size, max(1, int(max_bytes / mean_row_bytes))
+            )
+        self.max_size = max(self.max_size, self.min_size)
+        self.factor = factor
+        self.samples = max(1, samples)
+        self.timer = timer
+        self.size = self._clip(size)
+        self.best_size = self.size
+        self.history = []
+
+    def _clip(self, size):
+        return int(min(max(int(round(size)), self.min_size), self.max_size))
+
+    def __iter__(self):
+        start = 0
+        direction = 1
+        factor = self.factor
+        prev_rate = None
+        rates = {}  # the measured rates of each size
+        num_measured = 0  # at the current size, since it was last set
+        while start < len(self.df):
+            size = self.size
+            subdf = self.df.iloc[start : start + size]
+            tic = self.timer()
+            yield subdf
+            elapsed = self.timer() - tic
+            start += len(subdf)
+            rate = len(subdf) / elapsed if elapsed > 0 else float("inf")
+            self.history.append((len(subdf), rate))
+            if len(subdf) < size or factor < self._MIN_FACTOR:
+                continue
+            rates.setdefault(size, []).append(rate)
+            num_measured += 1
+            if num_measured < self.samples:
+                continue
+            num_measured = 0
+            medians = {
+                each_size: float(np.median(size_rates))
+                for each_size, size_rates in rates.items()
+            }
+            rate = medians[size]
+            self.best_size = max(medians, key=medians.get)
+            if prev_rate is not None and rate < prev_rate:
+                direction = -direction
+                factor = factor**0.5
+            prev_rate = rate
+            if factor < self._MIN_FACTOR:
+                self.size = self.best_size
+                continue
+            new_size = self._clip(size * factor**direction)
+            if new_size == size:  # hit a bound; head back
+                direction = -direction
+                new_size = self._clip(size * factor**direction)
+            self.size = new_size
+
+
+def _row_fields(columns):
+    """Returns valid, unique attribute names for the given column labels,
+    replacing invalid ones with positional names, as itertuples does."""
+    fields = []
+    for i, col in enumerate(columns):
+        if (
+            not isinstance(col, str)
+            or not col.isidentifier()
+            or keyword.iskeyword(col)
+            or col.startswith("_")
+            or col in fields
+        ):
+            col = "_{}".format(i)
+        fields.append(col)
+    return tuple(fields)
+
+
+@functools.lru_cache(maxsize=64)
+def _row_class(fields, name):
+    """Returns a lightweight row class with the given slots."""
+    args = ", ".join(fields)
+    namespace = {}
+    exec(
+        "def __init__(self, {}):\n    {}\n".format(
+            args,
+            "\n    ".join("self.{0} = {0}".format(field) for field in fields)
+            or "pass",
+        ),
+        namespace,
+    )
+
+    def __repr__(self):
+        return "{}({})".format(
+            name,
+            ", ".join(
+                "{}={!r}".format(field, getattr(self, field))
+                for field in fields
+            ),
+        )
+
+    return type(
+        name,
+        (object,),
+        {
+            "__slots__": fields,
+            "__init__": namespace["__init__"],
+            "__repr__": __repr__,
+        },
+    )
+
+
+def iter_rows(data, row_type="tuple", index=False, name="Row"):
+    """Get a generator yielding the rows of a dataframe, or of a stream of
+    dataframes, fast.
+
+    Each dataframe is converted once into a list of values per column, and
+    rows are then zipped from these lists, avoiding the per-row overhead of
+    pandas.DataFrame.iterrows and pandas.DataFrame.itertuples. Values are
+    native Python objects, as given by pandas.Series.tolist.
+
+    Arguments
+    ---------
+    data : pandas.DataFrame or iterable
+        A dataframe, or an iterable of dataframes of the same columns, such as
+        a generator of pdutil.iter.
+    row_type : str, default 'tuple'
+        Either 'tuple', to yield a plain tuple per row, or 'object', to yield
+        a lightweight object per row, with a slot per column. Column labels
+        that are not valid attribute names are replaced by positional names,
+        e.g. _1.
+    index : bool, default False
+        If set to True, the index label of each row is yielded as its first
+        value, or as its Index attribute.
+    name : str, default 'Row'
+        The name of the class of row objects.
+
+    Returns
+    -------
+    generator
+        A generator yielding a tuple, or an object, per row.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> data = [[23, "Jen"], [42, "Ray"], [15, "Fin"]]
+    >>> df = pd.DataFrame(data, columns=['age', 'name'])
+    >>> chunks = pdutil.iter.sub_dfs_by_size(df, 2)
+    >>> for row in pdutil.iter.iter_rows(chunks, 'object'): print(row)
+    Row(age=23, name='Jen')
+    Row(age=42, name='Ray')
+    Row(age=15, name='Fin')
+    """
+    if row_type not in ("tuple", "object"):
+        raise ValueError("row_type must be either 'tuple' or 'object'.")
+    if isinstance(data, pd.DataFrame):
+        data = [data]
+    for df in data:
+        columns = [df.iloc[:, i].tolist() for i in range(df.shape[1])]
+        labels = list(df.columns)
+        if index:
+            columns.insert(0, df.index.tolist())
+            labels.insert(0, "Index")
+        if row_type == "tuple":
+            yield from zip(*columns)
+        else:
+            row_class = _row_class(_row_fields(labels), name)
+            yield from itertools.starmap(row_class, zip(*columns))
+
+
+class _ColumnBuffer(object):
+    """A growable, preallocated buffer of the values of some columns.
+
+    Columns of a single numpy dtype share a 2d array; columns of any other
+    dtype are buffered one at a time, as objects.
+    """
+
+    def __init__(self, dtype, positions, capacity):
+        self.dtype = dtype
+        self.positions = positions
+        self.is_numpy = isinstance(dtype, np.dtype)
+        if self.is_numpy:
+            self.values = np.empty((capacity, len(positions)), dtype)
+        else:
+            self.values = np.empty((capacity, 1), object)
+
+    def grow(self, capacity, size):
+        values = np.empty(
+            (capacity,) + self.values.shape[1:], self.values.dtype
+        )
+        values[:size] = self.values[:size]
+        self.values = values
+
+    def extract(self, chunk, num_columns):
+        """Returns the values of the buffered columns of the given chunk, or
+        None if they are not of the dtype of this buffer."""
+        if self.is_numpy and len(self.positions) == num_columns:
+            values = chunk.to_numpy()
+        elif self.is_numpy and len(self.positions) > 1:
+            values = chunk.iloc[:, self.positions].to_numpy()
+        else:
+            values = chunk.iloc[:, self.positions[0]]
+            if values.dtype != self.dtype:
+                return None
+            values = values.to_numpy(dtype=None if self.is_numpy else object)
+        if self.is_numpy and values.dtype != self.dtype:
+            return None
+        return values.reshape(len(values), self.values.shape[1])
+
+    def put(self, start, values):
+        self.values[start : start + len(values)] = values
+
+    def result(self, size):
+        values = self.values[:size]
+        if size < len(self.values):
+            values = values.copy()
+        if self.is_numpy:
+            return values
+        return pd.array(values[:, 0], dtype=self.dtype)
+
+    def result_column(self, size):
+        values = self.result(size)
+        return values[:, 0] if self.is_numpy else values
+
+
+def _column_buffers(dtypes, capacity):
+    """Returns buffers for columns of the given dtypes, grouping columns of
+    the same numpy dtype."""
+    buffers = []
+    by_dtype = {}
+    for position, dtype in enumerate(dtypes):
+        if isinstance(dtype, np.dtype):
+            by_dtype.setdefault(dtype, []).append(position)
+        else:
+            buffers.append(_ColumnBuffer(dtype, [position], capacity))
+    for dtype, positions in by_dtype.items():
+        buffers.append(_ColumnBuffer(dtype, positions, capacity))
+    return buffers
+
+
+def concat_chunks(chunks, total_rows=None):
+    """Returns a dataframe concatenating the given chunks, in order.
+
+    The inverse of sub_dfs_by_size. As long as all chunks share the columns
+    and dtypes of the first one, the values of each chunk are copied straight
+    into per-column arrays, preallocated by total_rows and grown as needed,
+    so a generator of chunks is consumed without holding all chunks at once.
+    Otherwise, the remaining chunks are concatenated with pandas.concat.
+
+    Arguments
+    ---------
+    chunks : iterable
+        An iterable of dataframes, such as a generator of pdutil.iter.
+    total_rows : int, optional
+        The total number of rows in all chunks, if known in advance.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The concatenation of all given chunks.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> data = [[23, "Jen"], [42, "Ray"], [15, "Fin"]]
+    >>> df = pd.DataFrame(data, columns=['age', 'name'])
+    >>> chunks = pdutil.iter.sub_dfs_by_size(df, 2)
+    >>> print(pdutil.iter.concat_chunks(chunks, total_rows=3))
+       age name
+    0   23  Jen
+    1   42  Ray
+    2   15  Fin
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        return pd.DataFrame()
+    columns = first.columns
+    if not columns.is_unique or isinstance(first.index, pd.MultiIndex):
+        return pd.concat(itertools.chain([first], chunks))
+    capacity = max(total_rows or 0, len(first), 1)
+    buffers = _column_buffers(list(first.dtypes), capacity)
+    # a range index is only materialized once a chunk breaks the range
+    index_name = first.index.name
+    range_start = range_stop = 0
+    index_buffer = None
+    if isinstance(first.index, pd.RangeIndex) and first.index.step == 1:
+        range_start = range_stop = first.index.start
+    else:
+        index_buffer = _ColumnBuffer(first.index.dtype, [0], capacity)
+    size = 0
+
+    def _result(size):
+        if index_buffer is None:
+            index = pd.RangeIndex(range_start, range_stop, name=index_name)
+        else:
+            index = pd.Index(
+                index_buffer.result_column(size),
+                dtype=index_buffer.dtype,
+                name=index_name,
+            )
+        # dtypes are given explicitly, so object values are not inferred
+        if len(buffers) == 1 and buffers[0].is_numpy:
+            return pd.DataFrame(
+                buffers[0].result(size),
+                index=index,
+                columns=columns,
+                dtype=buffers[0].dtype,
+                copy=False,
+            )
+        data = {}
+        for buffer in buffers:
+            values = buffer.result(size)
+            for i, position in enumerate(buffer.positions):
+                data[position] = (
+                    pd.Series(
+                        values[:, i],
+                        index=index,
+                        dtype=buffer.dtype,
+                        copy=False,
+                    )
+                    if buffer.is_numpy
+                    else values
+                )
+        data = {columns[i]: data[i] for i in range(len(columns))}
+        return pd.DataFrame(data, index=index, columns=columns, copy=False)
+
+    for chunk in itertools.chain([first], chunks):
+        index = chunk.index
+        if index_buffer is None and len(index) > 0:
+            if (
+                isinstance(index, pd.RangeIndex)
+                and index.step == 1
+                and index.start == range_stop
+            ):
+                range_stop += len(index)
+                index = None
+            else:
+                index_buffer = _ColumnBuffer(np.dtype(np.int64), [0], capacity)
+                index_buffer.put(
+                    0, np.arange(range_start, range_stop).reshape(-1, 1)
+                )
+        elif index_buffer is None:
+            index = None
+        values = None
+        if chunk.columns.equals(columns) and (
+            index is None or index.dtype == index_buffer.dtype
+        ):
+            values = [
+                buffer.extract(chunk, len(columns)) for buffer in buffers
+            ]
+        if values is None or any(value is None for value in values):
+            if index is None:
+                range_stop -= len(chunk)
+            return pd.concat(itertools.chain([_result(size), chunk], chunks))
+        new_size = size + len(chunk)
+        if new_size > capacity:
+            capacity = max(new_size, 2 * capacity)
+            for buffer in buffers + [index_buffer]:
+                if buffer is not None:
+                    buffer.grow(capacity, size)
+        for buffer, value in zip(buffers, values):
+            buffer.put(size, value)
+        if index is not None:
+            index_buffer.put(size, index.to_numpy().reshape(len(index), 1))
+        size = new_size
+    return _result(size)
@@ -0,0 +1,785 @@
+"""Out-of-core processing of pandas DataFrame chunk streams."""
+
+import collections
+import concurrent.futures
+import heapq
+import itertools
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from pdutil.serial import SerializationFormat
+
+from .iter import _hash_buckets, _hash_values
+from .sketch import BloomFilter
+
+
+def _as_list(labels):
+    """Returns the given column label, or list of labels, as a list."""
+    if isinstance(labels, list):
+        return labels
+    return [labels]
+
+
+def _serial_format(serial_format):
+    """Returns a SerializationFormat object by an object or a name."""
+    if isinstance(serial_format, str):
+        return SerializationFormat.by_name(serial_format)
+    return serial_format
+
+
+def _first_key(frame, by):
+    """Returns the key tuple of the first row of the given frame."""
+    return tuple(frame[col].iat[0] for col in by)
+
+
+def _last_key(frame, by):
+    """Returns the key tuple of the last row of the given frame."""
+    return tuple(frame[col].iat[-1] for col in by)
+
+
+def _count_upto(frame, by, bound, inclusive=True):
+    """Returns the number of leading rows of a frame sorted by the given
+    columns whose key tuple is lexicographically less than, or if inclusive
+    is set less than or equal to, the given bound."""
+    low, high = 0, len(frame)
+    for col, value in zip(by, bound):
+        segment = frame[col].array[low:high]
+        low, high = (
+            low + int(segment.searchsorted(value, "left")),
+            low + int(segment.searchsorted(value, "right")),
+        )
+        if low == high:
+            break
+    return high if inclusive else low
+
+
+def _next_nonempty(iterator):
+    """Returns the next non-empty frame of the given iterator, or None."""
+    for frame in iterator:
+        if len(frame):
+            return frame
+    return None
+
+
+def merge_sorted(iterators, by):
+    """Get a generator merging iterators of frames, each sorted, into one.
+
+    In each step, the bound is the smallest last key among the current frames
+    of all iterators. All rows up to the bound are cut with searchsorted,
+    merged and yielded, except that rows equal to the bound are held back in
+    iterators after the first one whose frame ends with the bound, as that
+    iterator may have more such rows to come. That frame is exhausted and
+    replaced in each step, so at most one frame per iterator is held in
+    memory. The first and last keys of the current frames are kept in heaps,
+    so each step only touches the frames holding rows up to the bound. Ties
+    are broken by iterator order, and key columns should hold no missing
+    values.
+
+    Arguments
+    ---------
+    iterators : list
+        A list of iterables of dataframes, the rows of each sorted in
+        ascending order by the given columns across all of its dataframes.
+    by : object or list
+        The label, or list of labels, of the column(s) rows are sorted by.
+
+    Returns
+    -------
+    generator
+        A generator yielding consecutive sorted dataframes, of varying sizes.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> shard1 = pd.DataFrame({'age': [8, 23, 42]})
+    >>> shard2 = pd.DataFrame({'age': [15, 37]}, index=[3, 4])
+    >>> merged = pdutil.iter.merge_sorted(
+    ...     [pdutil.iter.sub_dfs_by_size(shard1, 2), [shard2]], 'age')
+    >>> print(pd.concat(merged))
+       age
+    0    8
+    3   15
+    1   23
+    4   37
+    2   42
+    """
+    by = _as_list(by)
+    buffers = {}
+    first_keys = []
+    last_keys = []
+    for i, iterator in enumerate(iterators):
+        iterator = iter(iterator)
+        frame = _next_nonempty(iterator)
+        if frame is not None:
+            buffers[i] = [frame, iterator]
+            heapq.heappush(first_keys, (_first_key(frame, by), i))
+            heapq.heappush(last_keys, (_last_key(frame, by), i))
+    while buffers:
+        bound, first = last_keys[0]
+        touched = []
+        while first_keys and first_keys[0][0] <= bound:
+            touched.append(heapq.heappop(first_keys)[1])
+        parts = []
+        for i in sorted(touched):
+            frame, iterator = buffers[i]
+            count = _count_upto(frame, by, bound, inclusive=i <= first)
+            if count:
+                parts.append(frame.iloc[:count])
+                frame = frame.iloc[count:]
+            if len(frame) == 0:
+                # only the frame ending with the bound is exhausted
+                heapq.heappop(last_keys)
+                frame = _next_nonempty(iterator)
+                if frame is None:
+                    del buffers[i]
+                    continue
+                heapq.heappush(last_keys, (_last_key(frame, by), i))
+            buffers[i][0] = frame
+            heapq.heappush(first_keys, (_first_key(frame, by), i))
+        if len(parts) == 1:
+            yield parts[0]
+        elif parts:
+            yield pd.concat(parts).sort_values(by, kind="mergesort")
+
+
+def _read_blocks(paths, serial_format):
+    """Yields the frames serialized at the given paths, deleting each file
+    once read."""
+    for path in paths:
+        frame = serial_format.deserialize(path)
+        os.remove(path)
+        yield frame
+
+
+def _blocks(frames, block_size):
+    """Yields the rows of the given frames in blocks of block_size rows."""
+    pending = []
+    num_pending = 0
+    for frame in frames:
+        while len(frame):
+            part = frame.iloc[: block_size - num_pending]
+            frame = frame.iloc[len(part) :]
+            pending.append(part)
+            num_pending += len(part)
+            if num_pending == block_size:
+                yield pd.concat(pending)
+                pending = []
+                num_pending = 0
+    if pending:
+        yield pd.concat(pending)
+
+
+def _sorted_runs(chunks, by, max_rows):
+    """Yields the rows of the given chunks in sorted runs, each of the rows of
+    consecutive chunks adding up to at least max_rows rows, but the last."""
+    buffered = []
+    num_buffered = 0
+    for chunk in chunks:
+        buffered.append(chunk)
+        num_buffered += len(chunk)
+        if num_buffered >= max_rows:
+            yield pd.concat(buffered).sort_values(by, kind="mergesort")
+            buffered = []
+            num_buffered = 0
+    if num_buffered:
+        yield pd.concat(buffered).sort_values(by, kind="mergesort")
+
+
+def _spill_run(frames, run_dir, run, block_size, serial_format):
+    """Spills the given sorted frames to disk as a sorted run of blocks, and
+    returns the paths of its blocks."""
+    paths = []
+    for j, block in enumerate(_blocks(frames, block_size)):
+        paths.append(
+            os.path.join(
+                run_dir,
+                "run_{:06d}_{:06d}.{}".format(run, j, serial_format.ext),
+            )
+        )
+        serial_format.serialize(block, paths[-1])
+    return paths
+
+
+def external_sort(
+    chunks,
+    by,
+    block_size=None,
+    tmp_dir=None,
+    serial_format="pickle",
+    max_rows=1000000,
+    fan_in=16,
+):
+    """Get a generator yielding the rows of the given chunks, sorted.
+
+    Chunks are buffered into sorted runs of about max_rows rows, each sorted
+    in memory and spilled to disk as blocks of block_size rows. The sorted
+    runs are then merged, at most fan_in runs at once, holding one block per
+    run in memory; more runs are merged in several passes, each merging
+    groups of fan_in runs into longer runs spilled to disk. Rows are sorted
+    in ascending order, ties kept in their original order, and key columns
+    should hold no missing values.
+
+    Arguments
+    ---------
+    chunks : iterable
+        An iterable of dataframes, such as a generator of pdutil.iter or the
+        reader returned by pandas.read_csv when given a chunksize.
+    by : object or list
+        The label, or list of labels, of the column(s) to sort by.
+    block_size : int, optional
+        The number of rows in each spilled block. Defaults to max_rows
+        divided by fan_in, so merging holds about max_rows rows in memory.
+    tmp_dir : str, optional
+        The directory under which to spill sorted runs. Defaults to the
+        system's temporary directory.
+    serial_format : str or pdutil.serial.SerializationFormat, default 'pickle'
+        The serialization format of spilled blocks. Must preserve the index.
+    max_rows : int, default 1000000
+        The number of rows of each sorted run, sorted in memory at once.
+    fan_in : int, default 16
+        The maximum number of runs merged at once. Must be at least 2.
+
+    Returns
+    -------
+    generator
+        A generator yielding consecutive sorted dataframes, of varying sizes.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'age': [42, 15, 23, 8, 37]})
+    >>> chunks = pdutil.iter.sub_dfs_by_size(df, 2)
+    >>> sorted_df = pd.concat(pdutil.iter.external_sort(chunks, 'age'))
+    >>> print(sorted_df)
+       age
+    3    8
+    1   15
+    2   23
+    4   37
+    0   42
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2.")
+    by = _as_list(by)
+    serial_format = _serial_format(serial_format)
+    if block_size is None:
+        block_size = max(1, max_rows // fan_in)
+    run_dir = tempfile.mkdtemp(prefix="pdutil_sort_", dir=tmp_dir)
+    run_ids = itertools.count()
+    try:
+        runs = [
+            _spill_run(
+                [run], run_dir, next(run_ids), block_size, serial_format
+            )
+            for run in _sorted_runs(chunks, by, max_rows)
+        ]
+        while len(runs) > fan_in:
+            merged_runs = []
+            for i in range(0, len(runs), fan_in):
+                if i + 1 == len(runs):
+                    # a last run left alone is not rewritten
+                    merged_runs.append(runs[i])
+                    continue
+                group = [
+                    _read_blocks(paths, serial_format)
+                    for paths in runs[i : i + fan_in]
+                ]
+                merged_runs.append(
+                    _spill_run(
+                        merge_sorted(group, by),
+                        run_dir,
+                        next(run_ids),
+                        block_size,
+                        serial_format,
+                    )
+                )
+            runs = merged_runs
+        iterators = [_read_blocks(paths, serial_format) for paths in runs]
+        for frame in merge_sorted(iterators, by):
+            yield frame
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+
+_AGG_STATS = {
+    "count": ("count",),
+    "sum": ("sum",),
+    "min": ("min",),
+    "max": ("max",),
+    "mean": ("count", "mean"),
+    "var": ("count", "mean", "m2"),
+    "std": ("count", "mean", "m2"),
+}
+
+_STAT_COMBINERS = {"count": "sum", "sum": "sum", "min": "min", "max": "max"}
+
+
+def _agg_spec(agg, columns, by):
+    """Returns a list of (column, function) pairs and whether the result
+    columns should be flat, by the given aggregation specification."""
+    if not isinstance(agg, dict):
+        agg = {col: agg for col in columns if col not in by}
+    spec = []
+    for col, funcs in agg.items():
+        for func in _as_list(funcs):
+            if func not in _AGG_STATS:
+                raise ValueError(
+                    "Unsupported aggregation function {}; supported are "
+                    "{}.".format(func, ", ".join(sorted(_AGG_STATS)))
+                )
+            spec.append((col, func))
+    flat = all(isinstance(funcs, str) for funcs in agg.values())
+    return spec, flat
+
+
+def _stat_columns(spec):
+    """Returns the (column, stat) pairs needed to compute the given spec."""
+    stat_cols = []
+    for col, func in spec:
+        for stat in _AGG_STATS[func]:
+            if (col, stat) not in stat_cols:
+                stat_cols.append((col, stat))
+    return stat_cols
+
+
+def _partial_aggregates(chunk, by, stat_cols):
+    """Returns the partial aggregates of a chunk, indexed by group key."""
+    grouped = chunk.groupby(by)
+    partials = {}
+    for col, stat in stat_cols:
+        if stat == "m2":
+            partials[(col, stat)] = (
+                grouped[col].var(ddof=0) * grouped[col].count()
+            )
+        else:
+            partials[(col, stat)] = getattr(grouped[col], stat)()
+    return pd.DataFrame(partials, columns=pd.MultiIndex.from_tuples(stat_cols))
+
+
+def _combine_aggregates(partials):
+    """Combines the given partial aggregates into a single partial aggregate
+    per group key, merging means and m2 by the Welford/Chan formulas."""
+    partials = pd.concat(partials)
+    levels = list(range(partials.index.nlevels))
+    combined = {}
+    for col, stat in partials.columns:
+        if stat in _STAT_COMBINERS:
+            grouped = partials[(col, stat)].groupby(level=levels)
+            combined[(col, stat)] = getattr(grouped, _STAT_COMBINERS[stat])()
+    for col in partials.columns.get_level_values(0).unique():
+        if (col, "mean") not in partials.columns:
+            continue
+        count = partials[(col, "count")]
+        mean = partials[(col, "mean")]
+        weighted = (count * mean).fillna(0)
+        total_mean = weighted.groupby(level=levels).transform(
+            "sum"
+        ) / count.groupby(level=levels).transform("sum")
+        combined[(col, "mean")] = total_mean.groupby(level=levels).first()
+        if (col, "m2") in partials.columns:
+            m2 = partials[(col, "m2")].fillna(0) + count * (
+                mean - total_mean
+            ).pow(2).fillna(0)
+            combined[(col, "m2")] = m2.groupby(level=levels).sum()
+    return pd.DataFrame(combined, columns=partials.columns)
+
+
+def _final_aggregates(state, spec, flat):
+    """Returns the final aggregated frame of the given partial aggregates."""
+    res = {}
+    for col, func in spec:
+        if func == "mean":
+            values = state[(col, "mean")]
+        elif func in ("var", "std"):
+            count = state[(col, "count")]
+            values = state[(col, "m2")] / (count - 1)
+            values[count < 2] = np.nan
+            if func == "std":
+                values = np.sqrt(values)
+        else:
+            values = state[(col, func)]
+        res[col if flat else (col, func)] = values
+    return pd.DataFrame(res, index=state.index).sort_index()
+
+
+def chunked_groupby_agg(
+    chunks,
+    by,
+    agg,
+    max_groups=None,
+    num_partitions=16,
+    tmp_dir=None,
+    serial_format="pickle",
+):
+    """Returns the grouped aggregates of the rows of all given chunks.
+
+    Combinable partial aggregates are kept in memory per group key, and merged
+    with those of each new chunk. If the number of group keys in memory
+    exceeds max_groups, the partial aggregates are spilled to disk,
+    hash-partitioned by key, and each partition is later combined on its own.
+    Rows with missing group keys are dropped, as with pandas.DataFrame.groupby.
+
+    Arguments
+    ---------
+    chunks : iterable
+        An iterable of dataframes, such as a generator of pdutil.iter or the
+        reader returned by pandas.read_csv when given a chunksize.
+    by : object or list
+        The label, or list of labels, of the column(s) to group by.
+    agg : str, list or dict
+        The aggregation function(s) to apply, out of count, sum, min, max,
+        mean, var and std: a function name or a list of names, applied to
+        every column not grouped by, or a dict mapping column labels to a
+        function name or a list of names.
+    max_groups : int, optional
+        The maximum number of group keys to hold partial aggregates for in
+        memory before spilling them to disk. Unbounded if not given.
+    num_partitions : int, default 16
+        The number of partitions to spill partial aggregates to.
+    tmp_dir : str, optional
+        The directory under which to spill partial aggregates. Defaults to the
+        system's temporary directory.
+    serial_format : str or pdutil.serial.SerializationFormat, default 'pickle'
+        The serialization format of spilled partial aggregates. Must preserve
+        the index and the columns.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The aggregated frame, indexed by sorted group keys. Columns are as
+        those of pandas.DataFrame.agg - multi-level if any list of functions
+        is given.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'team': [1, 2, 1, 1], 'score': [3., 4., 5., 7.]})
+    >>> chunks = pdutil.iter.sub_dfs_by_size(df, 2)
+    >>> print(pdutil.iter.chunked_groupby_agg(
+    ...     chunks, 'team', {'score': ['sum', 'mean', 'var']})
+    ... )  # doctest: +NORMALIZE_WHITESPACE
+         score
+           sum mean  var
+    team
+    1     15.0  5.0  4.0
+    2      4.0  4.0  NaN
+    """
+    by = _as_list(by)
+    serial_format = _serial_format(serial_format)
+    spec = None
+    state = None
+    spill_dir = None
+    num_spills = 0
+    try:
+        for chunk in chunks:
+            if spec is None:
+                spec, flat = _agg_spec(agg, chunk.columns, by)
+                stat_cols = _stat_columns(spec)
+            partials = _partial_aggregates(chunk, by, stat_cols)
+            if state is None:
+                state = partials
+            else:
+                state = _combine_aggregates([state, partials])
+            if max_groups is not None and len(state) > max_groups:
+                if spill_dir is None:
+                    spill_dir = tempfile.mkdtemp(
+                        prefix="pdutil_groupby_", dir=tmp_dir
+                    )
+                _spill_partitions(
+                    state, num_partitions, spill_dir, num_spills, serial_format
+                )
+                num_spills += 1
+                state = None
+        if spec is None:
+            return pd.DataFrame()
+        if spill_dir is None:
+            return _final_aggregates(state, spec, flat)
+        if state is not None:
+            _spill_partitions(
+                state, num_partitions, spill_dir, num_spills, serial_format
+            )
+            num_spills += 1
+        results = []
+        for partition in range(num_partitions):
+            paths = [
+                _spill_path(spill_dir, partition, i, serial_format)
+                for i in range(num_spills)
+            ]
+            partials = [
+                partial
+                for partial in _read_blocks(paths, serial_format)
+                if len(partial)
+            ]
+            if partials:
+                state = _combine_aggregates(partials)
+                results.append(_final_aggregates(state, spec, flat))
+        return pd.concat(results).sort_index()
+    finally:
+        if spill_dir is not None:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+
+def _spill_path(spill_dir, partition, spill, serial_format):
+    """Returns the path of a spilled partition."""
+    return os.path.join(
+        spill_dir,
+        "part_{:04d}_{:06d}.{}".format(partition, spill, serial_format.ext),
+    )
+
+
+def _spill_partitions(state, num_partitions, spill_dir, spill, serial_format):
+    """Spills the given partial aggregates to disk, partitioned by key hash."""
+    keys = state.index.to_frame(index=False)
+    buckets = _hash_buckets(keys, list(keys.columns), num_partitions)
+    positions = np.argsort(buckets, kind="mergesort")
+    bounds = np.append(
+        0, np.cumsum(np.bincount(buckets, minlength=num_partitions))
+    )
+    for partition in range(num_partitions):
+        part = state.iloc[positions[bounds[partition] : bounds[partition + 1]]]
+        serial_format.serialize(
+            part, _spill_path(spill_dir, partition, spill, serial_format)
+        )
+
+
+def _spill_by_hash(chunk, on, num_partitions, path_fmt, paths, serial_format):
+    """Spills the rows of the given chunk to disk, partitioned by key hash,
+    appending the path of each non-empty partition to its list in paths."""
+    buckets = _hash_buckets(chunk, on, num_partitions)
+    positions = np.argsort(buckets, kind="mergesort")
+    bounds = np.append(
+        0, np.cumsum(np.bincount(buckets, minlength=num_partitions))
+    )
+    for partition in range(num_partitions):
+        if bounds[partition + 1] > bounds[partition]:
+            path = path_fmt.format(partition, len(paths[partition]))
+            part = chunk.iloc[
+                positions[bounds[partition] : bounds[partition + 1]]
+            ]
+            serial_format.serialize(part, path)
+            paths[partition].append(path)
+
+
+def _read_partition(paths, schema, serial_format):
+    """Returns the concatenation of the given spilled partition parts."""
+    parts = list(_read_blocks(paths, serial_format))
+    if not parts:
+        return schema
+    return pd.concat(parts) if len(parts) > 1 else parts[0]
+
+
+def _join_partition(
+    left_paths, right_paths, left_schema, right_schema, serial_format, kwargs
+):
+    """Returns the join of a pair of spilled partitions."""
+    left = _read_partition(left_paths, left_schema, serial_format)
+    right = _read_partition(right_paths, right_schema, serial_format)
+    return pd.merge(left, right, **kwargs)
+
+
+def chunked_join(
+    left_chunks,
+    right_chunks,
+    on,
+    how="inner",
+    num_partitions=16,
+    processes=None,
+    tmp_dir=None,
+    serial_format="pickle",
+    **kwargs
+):
+    """Get a generator yielding the join of two streams of chunks.
+
+    The rows of both streams are spilled to disk, hash-partitioned by their
+    join keys, so equal keys of both sides fall in partitions of the same
+    ordinal. Each pair of partitions is then joined in memory, optionally in
+    a pool of processes. Key columns must be of the same dtypes on both sides,
+    except numeric keys, which may differ in dtype between sides or chunks,
+    e.g. where missing values made an integer column a float one.
+
+    Arguments
+    ---------
+    left_chunks : iterable
+        An iterable of dataframes, such as a generator of pdutil.iter or the
+        reader returned by pandas.read_csv when given a chunksize.
+    right_chunks : iterable
+        Another iterable of dataframes.
+    on : object or list
+        The label, or list of labels, of the column(s) to join on.
+    how : str, default 'inner'
+        The type of join, as with pandas.merge: 'inner', 'left', 'right' or
+        'outer'.
+    num_partitions : int, default 16
+        The number of partitions to spill each side to. Joining a pair of
+        partitions holds about 1/num_partitions of both sides in memory.
+    processes : int, optional
+        If given, pairs of partitions are joined in a pool of this many
+        processes, with no more than this many joins in flight at once.
+    tmp_dir : str, optional
+        The directory under which to spill partitions. Defaults to the
+        system's temporary directory.
+    serial_format : str or pdutil.serial.SerializationFormat, default 'pickle'
+        The serialization format of spilled partitions.
+    **kwargs
+        Additional keyword arguments are forwarded to pandas.merge.
+
+    Returns
+    -------
+    generator
+        A generator yielding the joined dataframe of each pair of partitions.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> users = pd.DataFrame({'uid': [1, 2, 3], 'name': ['Jen', 'Ray', 'Fin']})
+    >>> visits = pd.DataFrame({'uid': [3, 1, 3], 'page': ['a', 'b', 'c']})
+    >>> joined = pdutil.iter.chunked_join(
+    ...     pdutil.iter.sub_dfs_by_size(users, 2),
+    ...     pdutil.iter.sub_dfs_by_size(visits, 2),
+    ...     on='uid', num_partitions=4)
+    >>> print(pd.concat(joined).sort_values('page', ignore_index=True))
+       uid name page
+    0    3  Fin    a
+    1    1  Jen    b
+    2    3  Fin    c
+    """
+    serial_format = _serial_format(serial_format)
+    kwargs.update(on=on, how=how)
+    spill_dir = tempfile.mkdtemp(prefix="pdutil_join_", dir=tmp_dir)
+    try:
+        schemas = []
+        all_paths = []
+        for side, chunks in (("left", left_chunks), ("right", right_chunks)):
+            path_fmt = os.path.join(
+                spill_dir, side + "_{:04d}_{:06d}." + serial_format.ext
+            )
+            paths = [[] for _ in range(num_partitions)]
+            schema = None
+            for chunk in chunks:
+                if schema is None:
+                    schema = chunk.iloc[:0]
+                _spill_by_hash(
+                    chunk, on, num_partitions, path_fmt, paths, serial_format
+                )
+            if schema is None:
+                raise ValueError("Both sides must have at least one chunk.")
+            schemas.append(schema)
+            all_paths.append(paths)
+        tasks = [
+            (
+                all_paths[0][partition],
+                all_paths[1][partition],
+                schemas[0],
+                schemas[1],
+                serial_format,
+                kwargs,
+            )
+            for partition in range(num_partitions)
+        ]
+        if processes is None:
+            for task in tasks:
+                yield _join_partition(*task)
+            return
+        with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+            futures = collections.deque()
+            for task in tasks:
+                futures.append(executor.submit(_join_partition, *task))
+                if len(futures) >= processes:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+
+class _HashSet(object):
+    """An exact set of 64-bit hashes, held in a few sorted numpy arrays whose
+    sizes grow geometrically, so adding n hashes takes O(n log n)."""
+
+    def __init__(self):
+        self.levels = []
+
+    def add_hashes(self, hashes):
+        if len(hashes) == 0:
+            return
+        self.levels.append(np.sort(hashes))
+        while len(self.levels) > 1 and len(self.levels[-2]) <= 2 * len(
+            self.levels[-1]
+        ):
+            last = self.levels.pop()
+            self.levels[-1] = np.sort(np.concatenate((self.levels[-1], last)))
+
+    def contains_hashes(self, hashes):
+        res = np.zeros(len(hashes), dtype=bool)
+        for level in self.levels:
+            positions = np.minimum(
+                np.searchsorted(level, hashes), len(level) - 1
+            )
+            res |= level[positions] == hashes
+        return res
+
+
+def dedup_chunks(
+    chunks, subset=None, method="exact", capacity=None, error_rate=0.001
+):
+    """Get a generator yielding the rows of the given chunks not seen before.
+
+    Each row is identified by a 64-bit hash of its values, and rows whose hash
+    was seen in this or any previous chunk are dropped, keeping first
+    occurrences, as with pandas.DataFrame.drop_duplicates. Seen hashes are
+    kept either in an exact set, taking 8 bytes per distinct row, or in a
+    Bloom filter of bounded size, which drops each new row with probability
+    error_rate.
+
+    Arguments
+    ---------
+    chunks : iterable
+        An iterable of dataframes of the same columns and dtypes, such as a
+        generator of pdutil.iter or the reader returned by pandas.read_csv
+        when given a chunksize. Numeric columns may differ in dtype between
+        chunks, e.g. where missing values made an integer column a float one.
+    subset : list, optional
+        The labels of the columns identifying duplicate rows. By default, all
+        columns are used.
+    method : str, default 'exact'
+        Either 'exact' or 'bloom'.
+    capacity : int, optional
+        The number of distinct rows expected. Required if method is 'bloom'.
+    error_rate : float, default 0.001
+        The false-positive rate of the Bloom filter.
+
+    Returns
+    -------
+    generator
+        A generator yielding, for each chunk, a possibly empty sub-dataframe
+        of its first-seen rows.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'user': [1, 2, 1, 3, 2], 'page': list('aaaba')})
+    >>> chunks = pdutil.iter.sub_dfs_by_size(df, 2)
+    >>> for subdf in pdutil.iter.dedup_chunks(chunks): print(list(subdf.index))
+    [0, 1]
+    [3]
+    []
+    """
+    if method == "exact":
+        seen = _HashSet()
+    elif method == "bloom":
+        if capacity is None:
+            raise ValueError("A capacity is required for the bloom method.")
+        seen = BloomFilter(capacity, error_rate)
+    else:
+        raise ValueError("method must be either 'exact' or 'bloom'.")
+    for chunk in chunks:
+        keys = chunk if subset is None else chunk[subset]
+        hashes = _hash_values(keys)
+        first = ~pd.Series(hashes).duplicated().values
+        first[first] = ~seen.contains_hashes(hashes[first])
+        seen.add_hashes(hashes[first])
+        yield chunk[first]
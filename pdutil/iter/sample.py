@@ -0,0 +1,140 @@
+"""Streaming sampling of pandas DataFrame chunks."""
+
+import numpy as np
+import pandas as pd
+
+from .iter import _key_codes, _random_state
+
+
+def _top_positions(keys, k):
+    """Returns the sorted positions of the k largest of the given keys."""
+    if len(keys) <= k:
+        return np.arange(len(keys))
+    return np.sort(np.argpartition(-keys, k - 1)[:k])
+
+
+def reservoir_sample(chunks, k, random_state=None):
+    """Returns a uniform random sample of k rows of the given chunks.
+
+    Every row is given a uniformly random key, and the k rows of the largest
+    keys are kept, which is a uniform sample without replacement. Rows of
+    each chunk with keys under the smallest key kept so far are discarded at
+    once, so only about k rows are held in memory.
+
+    Arguments
+    ---------
+    chunks : iterable
+        An iterable of dataframes, such as a generator of pdutil.iter or the
+        reader returned by pandas.read_csv when given a chunksize.
+    k : int
+        The number of rows to sample. All rows are returned if there are fewer.
+    random_state : int or numpy.random.RandomState, optional
+        The seed or random state used for sampling.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The sampled rows, in their order in the given chunks.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'val': range(1000)})
+    >>> chunks = pdutil.iter.sub_dfs_by_size(df, 100)
+    >>> len(pdutil.iter.reservoir_sample(chunks, 5, random_state=0))
+    5
+    """
+    random_state = _random_state(random_state)
+    sample = None
+    keys = None
+    for chunk in chunks:
+        if k == 0:
+            # nothing is sampled, but the columns are those of the chunks
+            return chunk.iloc[:0]
+        chunk_keys = random_state.random_sample(len(chunk))
+        if sample is None:
+            sample, keys = chunk.iloc[:0], chunk_keys[:0]
+        if len(sample) == k:
+            above = chunk_keys > keys.min()
+            chunk, chunk_keys = chunk[above], chunk_keys[above]
+        if len(chunk) == 0:
+            continue
+        sample = pd.concat([sample, chunk]) if len(sample) else chunk
+        keys = np.concatenate((keys, chunk_keys))
+        positions = _top_positions(keys, k)
+        sample, keys = sample.iloc[positions], keys[positions]
+    if sample is None:
+        return pd.DataFrame()
+    return sample
+
+
+def _stratum_quotas(frame, by, codes, quotas):
+    """Returns the quota of the stratum of each row of the given frame."""
+    if not isinstance(quotas, dict):
+        return np.full(len(codes), quotas)
+    _, first_positions = np.unique(codes, return_index=True)
+    keys = frame[by].iloc[first_positions]
+    if isinstance(by, list):
+        keys = list(keys.itertuples(index=False, name=None))
+    code_quotas = np.array([quotas.get(key, 0) for key in keys])
+    return code_quotas[codes]
+
+
+def stratified_sample(chunks, by, quotas, random_state=None):
+    """Returns a stratified random sample of the rows of the given chunks.
+
+    Every row is given a uniformly random key, and for each stratum - i.e.
+    value of the given columns - the rows of the largest keys are kept, up to
+    the quota of the stratum, giving a uniform sample without replacement of
+    each stratum.
+
+    Arguments
+    ---------
+    chunks : iterable
+        An iterable of dataframes, such as a generator of pdutil.iter or the
+        reader returned by pandas.read_csv when given a chunksize.
+    by : object or list
+        The label, or list of labels, of the column(s) defining strata.
+    quotas : int or dict
+        The number of rows to sample from each stratum, or a dict mapping
+        strata - values, or tuples of values if by is a list - to their
+        quotas. Strata missing from the dict are not sampled.
+    random_state : int or numpy.random.RandomState, optional
+        The seed or random state used for sampling.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The sampled rows, in their order in the given chunks.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'kind': ['a'] * 900 + ['b'] * 100})
+    >>> chunks = pdutil.iter.sub_dfs_by_size(df, 100)
+    >>> sample = pdutil.iter.stratified_sample(
+    ...     chunks, 'kind', {'a': 3, 'b': 2}, random_state=0)
+    >>> sample.kind.value_counts().sort_index().to_dict()
+    {'a': 3, 'b': 2}
+    """
+    random_state = _random_state(random_state)
+    sample = None
+    keys = None
+    for chunk in chunks:
+        chunk_keys = random_state.random_sample(len(chunk))
+        if sample is None:
+            sample, keys = chunk, chunk_keys
+        else:
+            sample = pd.concat([sample, chunk])
+            keys = np.concatenate((keys, chunk_keys))
+        if len(sample) == 0:
+            continue
+        codes = _key_codes(sample, by)
+        row_quotas = _stratum_quotas(sample, by, codes, quotas)
+        order = np.lexsort((-keys, codes))
+        ranks = pd.Series(codes[order]).groupby(codes[order]).cumcount()
+        keep = np.sort(order[ranks.values < row_quotas[order]])
+        sample, keys = sample.iloc[keep], keys[keep]
+    if sample is None:
+        return pd.DataFrame()
+    return sample
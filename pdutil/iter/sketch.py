@@ -0,0 +1,365 @@
+"""Mergeable streaming sketches over pandas DataFrame chunks."""
+
+import numpy as np
+import pandas as pd
+
+from .iter import _hash_values
+
+
+def _series(values):
+    """Returns the given values as a pandas.Series without missing values."""
+    if not isinstance(values, pd.Series):
+        values = pd.Series(values)
+    return values.dropna()
+
+
+def _hashes(values, seed=0):
+    """Returns the 64-bit hashes of the given values, by the given seed.
+
+    Numeric values are hashed by value, whatever their dtype, so sketches of
+    integer and float chunks merge correctly.
+    """
+    return _hash_values(values, hash_key="{:016d}".format(seed))
+
+
+class HyperLogLog(object):
+    """A HyperLogLog sketch estimating the number of distinct values.
+
+    The relative error of the estimate is about 1.04 / sqrt(2 ** p), using
+    2 ** p bytes of memory. Missing values are ignored.
+
+    Arguments
+    ---------
+    p : int, default 14
+        The number of hash bits used to choose a register, between 11 and 18.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'user': [i % 5000 for i in range(20000)]})
+    >>> hll = pdutil.iter.HyperLogLog()
+    >>> for subdf in pdutil.iter.sub_dfs_by_size(df, 3000):
+    ...     _ = hll.update(subdf.user)
+    >>> abs(hll.count() - 5000) < 100
+    True
+    """
+
+    def __init__(self, p=14):
+        if not 11 <= p <= 18:
+            raise ValueError("p must be between 11 and 18.")
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, values):
+        """Adds the given values to the sketch, and returns the sketch."""
+        hashes = _hashes(_series(values))
+        rest_bits = 64 - self.p
+        registers = (hashes >> np.uint64(rest_bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << rest_bits) - 1)
+        # rest has at most 53 bits, so frexp gives its exact bit length
+        bit_lengths = np.frexp(rest.astype(np.float64))[1]
+        ranks = (rest_bits - bit_lengths + 1).astype(np.uint8)
+        np.maximum.at(self.registers, registers, ranks)
+        return self
+
+    def merge(self, other):
+        """Merges another sketch into this one, and returns this sketch."""
+        if other.p != self.p:
+            raise ValueError("Can only merge sketches of the same p.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """Returns the estimated number of distinct values added."""
+        num_registers = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / num_registers)
+        estimate = (
+            alpha
+            * num_registers**2
+            / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        )
+        num_zeros = int(np.sum(self.registers == 0))
+        if estimate <= 2.5 * num_registers and num_zeros:
+            # linear counting for small cardinalities
+            estimate = num_registers * np.log(num_registers / num_zeros)
+        return int(round(estimate))
+
+
+class KLLSketch(object):
+    """A KLL sketch estimating quantiles of a stream of numeric values.
+
+    Values are buffered in a hierarchy of compactors; a full compactor is
+    sorted and every other value, from a random offset, is promoted to the
+    next level with double the weight. The rank error of estimated quantiles
+    is about 1.7 / k. Missing values are ignored.
+
+    Arguments
+    ---------
+    k : int, default 200
+        The capacity of the top compactor, trading memory for accuracy.
+    random_state : int or numpy.random.RandomState, optional
+        The seed or random state used for choosing compaction offsets.
+
+    Example
+    -------
+    >>> import numpy as np; import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'latency': np.arange(100000)})
+    >>> kll = pdutil.iter.KLLSketch(random_state=0)
+    >>> for subdf in pdutil.iter.sub_dfs_by_size(df, 10000):
+    ...     _ = kll.update(subdf.latency)
+    >>> abs(kll.quantile(0.5) - 50000) < 2000
+    True
+    """
+
+    def __init__(self, k=200, random_state=None):
+        self.k = k
+        self.num_values = 0
+        self.compactors = [np.empty(0, dtype=np.float64)]
+        if isinstance(random_state, np.random.RandomState):
+            self._random_state = random_state
+        else:
+            self._random_state = np.random.RandomState(random_state)
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            items = np.sort(items)
+            if len(items) % 2:
+                leftover, items = items[-1:], items[:-1]
+            else:
+                leftover = items[:0]
+            if level + 1 == len(self.compactors):
+                self.compactors.append(np.empty(0, dtype=np.float64))
+            offset = self._random_state.randint(2)
+            self.compactors[level + 1] = np.concatenate(
+                (self.compactors[level + 1], items[offset::2])
+            )
+            self.compactors[level] = leftover
+            # capacities change with the number of levels; start over
+            level = 0
+
+    def update(self, values):
+        """Adds the given values to the sketch, and returns the sketch."""
+        values = _series(values).values.astype(np.float64)
+        self.num_values += len(values)
+        self.compactors[0] = np.concatenate((self.compactors[0], values))
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Merges another sketch into this one, and returns this sketch."""
+        for level, items in enumerate(other.compactors):
+            if level == len(self.compactors):
+                self.compactors.append(np.empty(0, dtype=np.float64))
+            self.compactors[level] = np.concatenate(
+                (self.compactors[level], items)
+            )
+        self.num_values += other.num_values
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """Returns the estimated q-quantile, or an array of quantiles if q is
+        an array, of the values added."""
+        items = np.concatenate(self.compactors)
+        if len(items) == 0:
+            return np.nan if np.ndim(q) == 0 else np.full(np.shape(q), np.nan)
+        weights = np.concatenate(
+            [
+                np.full(len(items), 2.0**level)
+                for level, items in enumerate(self.compactors)
+            ]
+        )
+        order = np.argsort(items, kind="mergesort")
+        cum_weights = np.cumsum(weights[order])
+        positions = np.searchsorted(
+            cum_weights, np.asarray(q) * cum_weights[-1], "left"
+        )
+        res = items[order][np.minimum(positions, len(items) - 1)]
+        if np.ndim(q) == 0:
+            return float(res)
+        return res
+
+
+class CountMinSketch(object):
+    """A count-min sketch estimating value frequencies and heavy hitters.
+
+    Estimated counts never fall below true counts, and exceed them by at most
+    about 2.7 * total_count / width, with probability 1 - exp(-depth). The
+    top_k values of highest estimated counts seen so far are tracked as heavy
+    hitters. Missing values are ignored.
+
+    Arguments
+    ---------
+    width : int, default 2048
+        The number of counters in each row of the sketch.
+    depth : int, default 5
+        The number of rows, each using its own hash function.
+    top_k : int, default 100
+        The number of heavy hitters to track.
+
+    Example
+    -------
+    >>> import pandas as pd; import pdutil;
+    >>> df = pd.DataFrame({'page': ['home'] * 500 + list(range(1000))})
+    >>> cms = pdutil.iter.CountMinSketch(top_k=1)
+    >>> for subdf in pdutil.iter.sub_dfs_by_size(df, 300):
+    ...     _ = cms.update(subdf.page)
+    >>> cms.heavy_hitters()
+    home    500
+    dtype: int64
+    """
+
+    def __init__(self, width=2048, depth=5, top_k=100):
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self._heavy = pd.Series([], dtype=np.int64)
+
+    def _columns(self, values):
+        """Returns the counter of each value in each row of the sketch."""
+        return [
+            (_hashes(values, seed) % np.uint64(self.width)).astype(np.intp)
+            for seed in range(self.depth)
+        ]
+
+    def estimate(self, values):
+        """Returns an array of the estimated counts of the given values."""
+        values = pd.Series(values)
+        if len(values) == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.min(
+            [
+                self.table[row][columns]
+                for row, columns in enumerate(self._columns(values))
+            ],
+            axis=0,
+        )
+
+    def _update_heavy(self, candidates):
+        candidates = pd.Index(self._heavy.index).append(pd.Index(candidates))
+        candidates = candidates.unique()
+        estimates = pd.Series(self.estimate(candidates), index=candidates)
+        self._heavy = estimates.sort_values(
+            ascending=False, kind="mergesort"
+        ).iloc[: self.top_k]
+
+    def update(self, values):
+        """Adds the given values to the sketch, and returns the sketch."""
+        counts = _series(values).value_counts(sort=False)
+        uniques = pd.Series(counts.index)
+        for row, columns in enumerate(self._columns(uniques)):
+            np.add.at(self.table[row], columns, counts.values)
+        self._update_heavy(counts.index)
+        return self
+
+    def merge(self, other):
+        """Merges another sketch into this one, and returns this sketch."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Can only merge sketches of the same shape.")
+        self.table += other.table
+        self._update_heavy(other._heavy.index)
+        return self
+
+    def heavy_hitters(self, num=None):
+        """Returns a series of the estimated counts of the num, or top_k,
+        values of highest estimated counts, in descending order."""
+        return self._heavy.iloc[:num]
+
+
+def _mix(hashes):
+    """Returns the splitmix64 finalization of the given 64-bit hashes."""
+    with np.errstate(over="ignore"):
+        hashes = hashes ^ (hashes >> np.uint64(30))
+        hashes = hashes * np.uint64(0xBF58476D1CE4E5B9)
+        hashes = hashes ^ (hashes >> np.uint64(27))
+        hashes = hashes * np.uint64(0x94D049BB133111EB)
+        return hashes ^ (hashes >> np.uint64(31))
+
+
+class BloomFilter(object):
+    """A Bloom filter testing set membership with a bounded false-positive
+    rate and no false negatives.
+
+    Arguments
+    ---------
+    capacity : int
+        The number of distinct values expected to be added.
+    error_rate : float, default 0.01
+        The false-positive rate of membership tests once capacity values were
+        added.
+
+    Example
+    -------
+    >>> import pdutil
+    >>> bloom = pdutil.iter.BloomFilter(capacity=1000).update(['a', 'b'])
+    >>> bloom.contains(['a', 'c'])
+    array([ True, False])
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = int(
+            np.ceil(-capacity * np.log(error_rate) / np.log(2) ** 2)
+        )
+        self.num_hashes = max(
+            1, int(round(self.num_bits / capacity * np.log(2)))
+        )
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, hashes):
+        """Returns the bit positions of the given hashes, by double hashing."""
+        step = _mix(hashes) | np.uint64(1)
+        num_bits = np.uint64(self.num_bits)
+        with np.errstate(over="ignore"):
+            return [
+                ((hashes + np.uint64(i) * step) % num_bits).astype(np.intp)
+                for i in range(self.num_hashes)
+            ]
+
+    def add_hashes(self, hashes):
+        """Adds values by their 64-bit hashes, and returns the filter."""
+        for positions in self._positions(hashes):
+            np.bitwise_or.at(
+                self.bits,
+                positions >> 3,
+                np.left_shift(1, positions & 7).astype(np.uint8),
+            )
+        return self
+
+    def contains_hashes(self, hashes):
+        """Returns a boolean array telling, for the 64-bit hash of each value,
+        whether the value was possibly added."""
+        res = np.ones(len(hashes), dtype=bool)
+        for positions in self._positions(hashes):
+            res &= (self.bits[positions >> 3] >> (positions & 7)) & 1 == 1
+        return res
+
+    def update(self, values):
+        """Adds the given values to the filter, and returns the filter."""
+        return self.add_hashes(_hashes(_series(values)))
+
+    def contains(self, values):
+        """Returns a boolean array telling, for each of the given values,
+        whether it was possibly added to the filter."""
+        return self.contains_hashes(_hashes(pd.Series(values)))
+
+    def merge(self, other):
+        """Merges another filter into this one, and returns this filter."""
+        if (other.num_bits, other.num_hashes) != (
+            self.num_bits,
+            self.num_hashes,
+        ):
+            raise ValueError("Can only merge filters of the same shape.")
+        np.bitwise_or(self.bits, other.bits, out=self.bits)
+        return self
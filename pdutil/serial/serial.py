@@ -51,6 +51,11 @@ SerializationFormat.json = SerializationFormat(
 )
 SerializationFormat.__save_by_name__("json", SerializationFormat.json)
 
+SerializationFormat.pickle = SerializationFormat(
+    ext="pickle", serialize=pd.DataFrame.to_pickle, deserialize=pd.read_pickle
+)
+SerializationFormat.__save_by_name__("pickle", SerializationFormat.pickle)
+
 
 try:
     SerializationFormat.feather = SerializationFormat(
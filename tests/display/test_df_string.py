@@ -0,0 +1,124 @@
+"""Test pdutil.display.df_string."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.display import df_string
+from pdutil.display.display import _float_strings
+
+
+def _cell_by_cell(df, percentage_columns=(), format_map=None, **kwargs):
+    formatters = {}
+    for col, dtype in df.dtypes.items():
+        if col in percentage_columns:
+            formatters[col] = "{:,.2f} %".format
+        elif dtype == "float64":
+            formatters[col] = "{:,.2f}".format
+    formatters.update(format_map or {})
+    return df.to_string(formatters=formatters, **kwargs)
+
+
+EDGE_VALUES = [
+    0.0,
+    -0.0,
+    np.nan,
+    np.inf,
+    -np.inf,
+    0.005,
+    0.015,
+    1.005,
+    2.675,
+    -0.004,
+    -999.995,
+    999.995,
+    123456.785,
+    9999999999999.99,
+    1e13,
+    -1e60,
+    5e-324,
+]
+
+
+def test_float_strings():
+    rng = np.random.RandomState(0)
+    values = np.concatenate(
+        [
+            EDGE_VALUES,
+            rng.randn(20000) * 10.0 ** rng.randint(-4, 20, 20000),
+            rng.randint(-(10**7), 10**7, 20000) / 1000,
+        ]
+    )
+    expected = ["{:,.2f}".format(value) for value in values]
+    assert _float_strings(values).tolist() == expected
+    expected = ["{:,.2f} %".format(value) for value in values]
+    assert _float_strings(values, " %").tolist() == expected
+
+
+NUM_ROWS = 50
+DF_DATA = {
+    "id": np.arange(NUM_ROWS),
+    "amount": np.random.RandomState(1).randn(NUM_ROWS) * 1e6,
+    "name": np.random.RandomState(2).choice(
+        ["a", "bb", "a much longer name"], NUM_ROWS
+    ),
+    "a very long header": np.random.RandomState(3).randn(NUM_ROWS),
+    "rate": np.random.RandomState(4).rand(NUM_ROWS),
+    "count": np.random.RandomState(5).randint(-5, 5, NUM_ROWS),
+}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_cell_by_cell(seed):
+    rng = np.random.RandomState(seed)
+    df = pd.DataFrame(DF_DATA)
+    df.loc[rng.rand(NUM_ROWS) < 0.2, "amount"] = np.nan
+    df.loc[rng.rand(NUM_ROWS) < 0.1, "rate"] = -0.0
+    if seed % 2:
+        df.index = rng.randint(-1000, 1000, NUM_ROWS)
+    if seed == 4:
+        df = df[["amount", "rate"]]
+    res = df_string(df, percentage_columns=["rate", "count"])
+    assert res == _cell_by_cell(df, percentage_columns=["rate", "count"])
+
+
+def test_matches_cell_by_cell_on_negative_range_index():
+    df = pd.DataFrame(DF_DATA)
+    # unlike other integer indexes, pandas does not align range index signs
+    df.index = pd.RangeIndex(-25, 25)
+    assert df_string(df) == _cell_by_cell(df)
+
+
+@pytest.mark.parametrize(
+    "modify",
+    [
+        lambda df: df.set_index("name"),
+        lambda df: df.rename_axis("ix"),
+        lambda df: df.set_index(["id", "name"]),
+        lambda df: df.rename(columns={"amount": " amount"}),
+        lambda df: df.rename(columns={"id": 1}),
+    ],
+)
+def test_matches_cell_by_cell_on_fallback(modify):
+    df = modify(pd.DataFrame(DF_DATA))
+    assert df_string(df, ["rate"]) == _cell_by_cell(df, ["rate"])
+
+
+@pytest.mark.parametrize("justify", ["left", "center"])
+def test_matches_cell_by_cell_justified(justify):
+    df = pd.DataFrame(DF_DATA)
+    with pd.option_context("display.colheader_justify", justify):
+        assert df_string(df) == _cell_by_cell(df)
+
+
+def test_kwargs_and_format_map():
+    df = pd.DataFrame(DF_DATA)
+    format_map = {"amount": "{:.1f}".format}
+    res = df_string(df, format_map=format_map, na_rep="-", index=False)
+    expected = _cell_by_cell(
+        df, format_map=format_map, na_rep="-", index=False
+    )
+    assert res == expected
+    assert df_string(df, format_map=format_map) == _cell_by_cell(
+        df, format_map=format_map
+    )
@@ -0,0 +1,72 @@
+"""Test pdutil.display.df_summary_string."""
+
+import numpy as np
+import pandas as pd
+
+from pdutil.display import df_summary_string
+from pdutil.display.display import _column_summary, _estimate_distinct
+
+NUM_ROWS = 300000
+DF_DATA = {
+    "user": np.random.RandomState(1).randint(0, 50000, NUM_ROWS),
+    "kind": np.random.RandomState(2).choice(
+        ["view", "click", "buy"], NUM_ROWS
+    ),
+    "amount": np.where(
+        np.random.RandomState(5).rand(NUM_ROWS) < 0.1,
+        np.nan,
+        np.random.RandomState(3).rand(NUM_ROWS) * 100,
+    ),
+    "flag": np.random.RandomState(4).rand(NUM_ROWS) < 0.5,
+}
+
+
+def test_exact_when_unsampled():
+    df = pd.DataFrame(DF_DATA).iloc[:1000]
+    summary = _column_summary(df, df, [0.5])
+    assert summary["nulls"].tolist() == df.isna().sum().tolist()
+    assert summary["distinct"].tolist() == df.nunique().tolist()
+    assert summary.loc["amount", "50%"] == df["amount"].median()
+    assert np.isnan(summary.loc["kind", "50%"])
+    assert np.isnan(summary.loc["flag", "50%"])
+
+
+def test_estimate_distinct():
+    values = pd.Series(np.arange(100000) % 20000)
+    sample = values.sample(5000, random_state=0)
+    estimate = _estimate_distinct(sample, len(values))
+    assert 16000 < estimate < 24000
+    assert _estimate_distinct(values, len(values)) == 20000
+    unique = pd.Series(np.arange(100000), dtype=float)
+    assert _estimate_distinct(unique.sample(5000), len(unique)) == 100000
+
+
+def test_sampled_summary():
+    df = pd.DataFrame(DF_DATA)
+    res = df_summary_string(df, sample_size=20000, random_state=0)
+    assert res.startswith("300,000 rows x 4 columns\n")
+    assert "estimated from a sample of" in res
+    summary = _column_summary(df, df.sample(20000, random_state=0), [0.5])
+    # null counts are exact
+    assert summary.loc["amount", "nulls"] == df["amount"].isna().sum()
+    assert summary.loc["kind", "distinct"] == 3
+    distinct = summary.loc["user", "distinct"]
+    assert abs(distinct - df["user"].nunique()) < 0.1 * df["user"].nunique()
+    assert abs(summary.loc["amount", "50%"] - 50) < 2
+
+
+def test_head_and_tail():
+    df = pd.DataFrame(DF_DATA).iloc[:100]
+    lines = df_summary_string(df, num_rows=3).split("\n")
+    assert lines[5] == "..."
+    assert lines[2].split()[0] == "0"
+    assert lines[8].split()[0] == "99"
+    assert "..." not in df_summary_string(df.iloc[:6], num_rows=3)
+    lines = df_summary_string(df, num_rows=0).split("\n")
+    assert lines[:3] == ["100 rows x 4 columns", "...", ""]
+
+
+def test_unhashable_and_empty():
+    df = pd.DataFrame({"tags": [[1], [2], [1]], "num": [1, 2, 3]})
+    assert "tags" in df_summary_string(df)
+    assert df_summary_string(df.iloc[:0]).startswith("0 rows x 2 columns")
@@ -0,0 +1,161 @@
+"""Test pdutil.display.df_to_html."""
+
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.display import df_to_html
+from pdutil.display.display import _cached_formatters, _formatters_dict
+
+DF_DATA = {
+    "amount": [1234.5, np.nan],
+    "success_rate": [0.25, 0.5],
+    "tags": [list(range(150)), []],
+}
+
+
+def test_options_untouched():
+    with pd.option_context(
+        "display.max_rows", 60, "display.colheader_justify", "right"
+    ):
+        html = df_to_html(pd.DataFrame(DF_DATA))
+        assert pd.get_option("display.max_rows") == 60
+        assert pd.get_option("display.colheader_justify") == "right"
+    assert '<tr style="text-align: center;">' in html
+    assert "<td>1,234.50</td>" in html
+    assert "<td>0.25 %</td>" in html
+    # sequences are displayed in full
+    assert "149]" in html
+
+
+def test_big_dataframe_options():
+    html = df_to_html(pd.DataFrame(DF_DATA))
+    options = [
+        "display.max_rows",
+        sys.maxsize,
+        "display.colheader_justify",
+        "center",
+        "display.max_seq_items",
+        sys.maxsize,
+    ]
+    with pd.option_context(*options):
+        formatters = _formatters_dict(pd.DataFrame(DF_DATA))
+        expected = (
+            pd.DataFrame(DF_DATA).to_html(formatters=formatters) + "<br>"
+        )
+    assert html == expected
+
+
+def test_options_untouched_by_threads():
+    df = pd.DataFrame(DF_DATA)
+    df["note"] = ["x" * 80, "y"]
+    options = {
+        key: pd.get_option(key)
+        for key in [
+            "display.max_rows",
+            "display.max_colwidth",
+            "display.max_seq_items",
+            "display.colheader_justify",
+        ]
+    }
+    expected = df_to_html(df)
+    with ThreadPoolExecutor(8) as executor:
+        htmls = list(executor.map(lambda _: df_to_html(df), range(1600)))
+    assert all(html == expected for html in htmls)
+    assert {key: pd.get_option(key) for key in options} == options
+    assert "x" * 80 in expected
+
+
+def test_named():
+    df = pd.DataFrame(DF_DATA)
+    df.name = "Report"
+    assert df_to_html(df).startswith("<br><h2> Report </h2><table")
+
+
+def test_formatters_cached():
+    df = pd.DataFrame(DF_DATA)
+    first = _formatters_dict(df)
+    hits = _cached_formatters.cache_info().hits
+    second = _formatters_dict(df.iloc[:1], percentage_columns=None)
+    assert _cached_formatters.cache_info().hits == hits + 1
+    assert first == second
+    assert set(first) == {"amount", "success_rate"}
+    formatters = _formatters_dict(df, percentage_columns=["amount"])
+    assert formatters["amount"](5) == "5.00 %"
+    assert formatters["success_rate"](5) == "5.00"
+
+
+NUM_ROWS = 2500
+BIG_DATA = {
+    "amount": np.random.RandomState(1).randn(NUM_ROWS) * 1e4,
+    "ratio": np.random.RandomState(2).rand(NUM_ROWS),
+    "name": np.random.RandomState(3).choice(["a", "b<c"], NUM_ROWS),
+}
+BIG_IX = pd.RangeIndex(NUM_ROWS, name="ix")
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 300, 5000])
+def test_chunked(chunk_rows):
+    df = pd.DataFrame(BIG_DATA, BIG_IX)
+    expected = df_to_html(df)
+    assert df_to_html(df, chunk_rows=chunk_rows) == expected
+
+
+@pytest.mark.parametrize(
+    "executor_class", [ThreadPoolExecutor, ProcessPoolExecutor]
+)
+def test_parallel(executor_class):
+    df = pd.DataFrame(BIG_DATA, BIG_IX)
+    expected = df_to_html(df, percentage_columns=["amount"])
+    with executor_class(max_workers=2) as executor:
+        res = df_to_html(
+            df,
+            percentage_columns=["amount"],
+            executor=executor,
+            chunk_rows=700,
+        )
+    assert res == expected
+    assert pd.get_option("display.colheader_justify") == "right"
+
+
+@pytest.mark.parametrize(
+    "executor_class", [None, ThreadPoolExecutor, ProcessPoolExecutor]
+)
+def test_parallel_whole_column_formats(executor_class):
+    rng = np.random.RandomState(0)
+    days = pd.to_timedelta(rng.randint(0, 5, NUM_ROWS), "D")
+    df = pd.DataFrame(
+        {
+            "day": pd.Timestamp("2020-01-01") + days,
+            "amount": (rng.randint(0, 400, NUM_ROWS) / 4).astype("float32"),
+            "span": days,
+        },
+        index=pd.MultiIndex.from_arrays(
+            [np.arange(NUM_ROWS) // 7, np.arange(NUM_ROWS) % 7]
+        ),
+    )
+    # the last row alone sets the format of each whole column
+    df.iloc[-1] = [
+        pd.Timestamp("2020-01-01 12:00"),
+        0.125,
+        pd.Timedelta(hours=12),
+    ]
+    expected = df_to_html(df)
+    assert "<td>2020-01-01 00:00:00</td>" in expected
+    assert "<td>1.000</td>" in expected
+    assert 'rowspan="7"' in expected
+    if executor_class is None:
+        assert df_to_html(df, chunk_rows=300) == expected
+        return
+    with executor_class(max_workers=2) as executor:
+        res = df_to_html(df, executor=executor, chunk_rows=300)
+    assert res == expected
+
+
+def test_parallel_empty():
+    df = pd.DataFrame(BIG_DATA, BIG_IX).iloc[:0]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert df_to_html(df, executor=executor) == df_to_html(df)
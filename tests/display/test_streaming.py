@@ -0,0 +1,161 @@
+"""Test pdutil.display streaming rendering functions."""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.display import (
+    df_string,
+    df_to_html,
+    iter_df_html,
+    iter_df_string,
+    write_df_html,
+    write_df_string,
+)
+
+NUM_ROWS = 40
+DF_DATA = {
+    "id": np.random.RandomState(1).randint(-(10**6), 10**6, NUM_ROWS),
+    "amount": np.where(
+        np.random.RandomState(6).rand(NUM_ROWS) < 0.1,
+        np.nan,
+        np.random.RandomState(2).randn(NUM_ROWS) * 1000,
+    ),
+    "name": np.random.RandomState(3).choice(
+        ["a", "bb", "a much longer name"], NUM_ROWS
+    ),
+    "rate": np.random.RandomState(4).rand(NUM_ROWS),
+    "n": np.random.RandomState(5).randint(0, 10**9, NUM_ROWS),
+}
+DF_IX = np.random.RandomState(7).randint(-1000, 10**6, NUM_ROWS)
+
+
+MIXED_DATA = {
+    "day": pd.to_datetime(
+        [
+            "1970-01-02 00:00",
+            "1970-01-03 00:00",
+            "1970-01-03 12:00",
+            None,
+            "1970-01-04 00:00",
+        ]
+    ),
+    "amount": np.array([55.25, 1.5, 2.0, np.nan, -3.125], dtype="float32"),
+    "small": np.array([1.0, 2.5, 1e-9, 4.0, 5.0], dtype="float32"),
+    "span": pd.to_timedelta(["1 days", "2 days", "1.5s", None, "3 days"]),
+}
+
+
+MIXED_IX = pd.MultiIndex.from_arrays([list("aabbb"), [1, 2, 1, 2, 3]])
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2])
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"index": False}, {"justify": "left"}, {"na_rep": "-"}]
+)
+def test_iter_df_string_whole_column_formats(chunk_rows, kwargs):
+    df = pd.DataFrame(MIXED_DATA)
+    expected = df_string(df, **kwargs) + "\n"
+    assert "".join(iter_df_string(df, chunk_rows, **kwargs)) == expected
+    assert "1970-01-02 00:00:00" in expected
+    assert "55.250" in expected
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2])
+def test_iter_df_string_multi_index(chunk_rows):
+    df = pd.DataFrame(MIXED_DATA, MIXED_IX)
+    expected = df_string(df) + "\n"
+    assert "".join(iter_df_string(df, chunk_rows)) == expected
+
+
+@pytest.mark.parametrize("names", [[None, None], ["group", "k"]])
+def test_iter_df_string_multi_index_widths(names):
+    ix = pd.MultiIndex.from_arrays(
+        [np.arange(35) // 3, np.arange(35) % 3], names=names
+    )
+    df = pd.DataFrame({"x": np.arange(35)}, index=ix)
+    expected = df_string(df) + "\n"
+    assert "".join(iter_df_string(df, 4)) == expected
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("chunk_rows", [1, 7, 1000])
+def test_iter_df_string_matches_df_string(seed, chunk_rows):
+    df = pd.DataFrame(DF_DATA, DF_IX)
+    df["amount"] *= 10.0 ** np.random.RandomState(seed).randint(0, 8)
+    parts = list(iter_df_string(df, chunk_rows, percentage_columns=["rate"]))
+    assert len(parts) == -(-NUM_ROWS // chunk_rows)
+    assert "".join(parts) == df_string(df, percentage_columns=["rate"]) + "\n"
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"index": False},
+        {"header": False},
+        {"na_rep": "-", "justify": "left"},
+        {"format_map": {"n": "{:,}".format}},
+    ],
+)
+def test_iter_df_string_kwargs(kwargs):
+    df = pd.DataFrame(DF_DATA, DF_IX).iloc[:30]
+    expected = df_string(df, **kwargs) + "\n"
+    assert "".join(iter_df_string(df, 4, **kwargs)) == expected
+
+
+def test_iter_df_string_stable_widths():
+    df = pd.DataFrame(DF_DATA, DF_IX).iloc[:30]
+    df.index.name = "ix"
+    lines = "".join(iter_df_string(df, 4)).splitlines()
+    assert len(lines) == 32
+    assert len(set(map(len, lines))) == 1
+
+
+def test_iter_df_string_empty():
+    df = pd.DataFrame(DF_DATA, DF_IX).iloc[:0]
+    assert "".join(iter_df_string(df, 4)) == df_string(df) + "\n"
+
+
+def test_write_df_string():
+    df = pd.DataFrame(DF_DATA, DF_IX).iloc[:25]
+    fp = io.StringIO()
+    write_df_string(df, fp, chunk_rows=6, percentage_columns=["rate"])
+    assert fp.getvalue() == df_string(df, ["rate"]) + "\n"
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 6, 1000])
+def test_iter_df_html(chunk_rows):
+    df = pd.DataFrame(DF_DATA, DF_IX).iloc[:25]
+    assert "".join(iter_df_html(df, chunk_rows)) == df_to_html(df)
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2])
+def test_iter_df_html_whole_column_formats(chunk_rows):
+    df = pd.DataFrame(MIXED_DATA)
+    expected = df_to_html(df)
+    assert "".join(iter_df_html(df, chunk_rows)) == expected
+    assert "<td>1970-01-02 00:00:00</td>" in expected
+    assert "<td>1.500</td>" in expected
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2])
+def test_iter_df_html_multi_index(chunk_rows):
+    df = pd.DataFrame(MIXED_DATA, MIXED_IX)
+    assert "".join(iter_df_html(df, chunk_rows)) == df_to_html(df)
+
+
+def test_write_df_html():
+    df = pd.DataFrame(DF_DATA, DF_IX).iloc[:25]
+    df = df.rename(columns={"name": "label"})
+    df.name = "Report"
+    fp = io.StringIO()
+    write_df_html(df, fp, chunk_rows=4, percentage_columns=["amount"])
+    assert fp.getvalue() == df_to_html(df, ["amount"])
+    assert fp.getvalue().startswith("<br><h2> Report </h2>")
+
+
+def test_iter_df_html_empty():
+    df = pd.DataFrame(DF_DATA, DF_IX).iloc[:0]
+    assert "".join(iter_df_html(df)) == df_to_html(df)
@@ -0,0 +1,58 @@
+"""Test pdutil.iter.AdaptiveSubDfs."""
+
+import pandas as pd
+
+from pdutil.iter import AdaptiveSubDfs
+
+
+class _Clock(object):
+    """A fake clock, advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_grows_under_fixed_overhead():
+    df = pd.DataFrame({"val": range(2000)})
+    clock = _Clock()
+    sub_dfs = AdaptiveSubDfs(df, size=4, max_size=256, timer=clock)
+    chunks = []
+    for subdf in sub_dfs:
+        clock.now += 0.002 + len(subdf) * 1e-6
+        chunks.append(subdf)
+    assert pd.concat(chunks).equals(df)
+    assert sub_dfs.best_size >= 64
+    assert len(sub_dfs.history) == len(chunks)
+
+
+def test_shrinks_under_superlinear_cost():
+    df = pd.DataFrame({"val": range(5000)})
+    clock = _Clock()
+    sub_dfs = AdaptiveSubDfs(df, size=128, timer=clock)
+    for subdf in sub_dfs:
+        clock.now += len(subdf) ** 2 * 2e-7
+    assert sub_dfs.best_size < 128
+
+
+def test_ignores_noisy_measurements():
+    df = pd.DataFrame({"val": range(2000)})
+    clock = _Clock()
+    sub_dfs = AdaptiveSubDfs(df, size=4, max_size=256, timer=clock)
+    for i, subdf in enumerate(sub_dfs):
+        # a single, spuriously fast, measurement of the first size
+        clock.now += 1e-9 if i == 1 else 0.002 + len(subdf) * 1e-6
+    assert sub_dfs.best_size >= 64
+    sub_dfs = AdaptiveSubDfs(df, size=4, max_size=256, samples=1, timer=clock)
+    for i, subdf in enumerate(sub_dfs):
+        clock.now += 1e-9 if i == 0 else 0.002 + len(subdf) * 1e-6
+    assert sub_dfs.best_size == 4
+
+
+def test_memory_cap():
+    df = pd.DataFrame({"txt": ["x" * 1000] * 100}, dtype=object)
+    sub_dfs = AdaptiveSubDfs(df, size=50, max_bytes=10000)
+    assert sub_dfs.max_size < 10
+    assert all(len(subdf) <= sub_dfs.max_size for subdf in sub_dfs)
@@ -0,0 +1,92 @@
+"""Test the asynchronous iterators of pdutil.iter."""
+
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from pdutil.iter import (
+    async_chunks,
+    async_map,
+    async_sub_dfs_by_num,
+    async_sub_dfs_by_size,
+)
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def _collect(aiterable):
+    async def _chunks():
+        chunks = []
+        async for chunk in aiterable:
+            chunks.append(chunk)
+        return chunks
+
+    return _run(_chunks())
+
+
+def test_async_sub_dfs():
+    df = pd.DataFrame({"val": range(10)})
+    chunks = _collect(async_sub_dfs_by_size(df, 3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+    chunks = _collect(async_sub_dfs_by_num(df, 2, weights=[1] * 9 + [9]))
+    assert [len(chunk) for chunk in chunks] == [9, 1]
+
+
+def test_chunks_produced_off_loop():
+    loop_thread = threading.get_ident()
+    threads = []
+
+    def _chunks():
+        for i in range(3):
+            threads.append(threading.get_ident())
+            yield i
+
+    assert _collect(async_chunks(_chunks())) == [0, 1, 2]
+    assert loop_thread not in threads
+
+
+def test_async_map_bounded():
+    running = [0]
+    max_running = [0]
+
+    async def _process(chunk):
+        running[0] += 1
+        max_running[0] = max(max_running[0], running[0])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        return len(chunk)
+
+    df = pd.DataFrame({"val": range(20)})
+    res = _run(
+        async_map(_process, async_sub_dfs_by_size(df, 2), concurrency=3)
+    )
+    assert res == [2] * 10
+    assert max_running[0] == 3
+
+
+def test_async_map_sync_func_and_iterable():
+    def _process(chunk):
+        time.sleep(0.01)
+        return chunk * 2
+
+    res = _run(async_map(_process, range(6), concurrency=2))
+    assert res == [0, 2, 4, 6, 8, 10]
+
+
+def test_async_map_error():
+    async def _process(chunk):
+        if chunk == 2:
+            raise ValueError("bad chunk")
+        return chunk
+
+    with pytest.raises(ValueError):
+        _run(async_map(_process, range(5)))
@@ -0,0 +1,66 @@
+"""Test pdutil.iter.chunked_groupby_agg."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.iter import chunked_groupby_agg, sub_dfs_by_size
+
+NUM_ROWS = 2000
+DF_DATA = {
+    "a": np.random.RandomState(1).randint(0, 300, NUM_ROWS),
+    "b": np.random.RandomState(2).choice(list("xyz"), NUM_ROWS),
+    "x": np.where(
+        np.random.RandomState(5).rand(NUM_ROWS) < 0.1,
+        np.nan,
+        np.random.RandomState(3).normal(1000, 5, NUM_ROWS),
+    ),
+    "y": np.random.RandomState(4).randint(0, 100, NUM_ROWS),
+}
+
+
+AGG = {"x": ["count", "sum", "min", "max", "mean", "var", "std"], "y": "sum"}
+
+
+def _assert_agg_equal(res, expected):
+    assert list(res.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(res, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("by", ["a", ["a", "b"]])
+@pytest.mark.parametrize("max_groups", [None, 50])
+def test_matches_pandas(tmpdir, by, max_groups):
+    df = pd.DataFrame(DF_DATA)
+    res = chunked_groupby_agg(
+        sub_dfs_by_size(df, 170),
+        by,
+        AGG,
+        max_groups=max_groups,
+        num_partitions=4,
+        tmp_dir=str(tmpdir),
+    )
+    _assert_agg_equal(res, df.groupby(by).agg(AGG))
+    assert tmpdir.listdir() == []
+
+
+def test_flat_columns():
+    df = pd.DataFrame(DF_DATA)
+    agg = {"x": "mean", "y": "max"}
+    res = chunked_groupby_agg(sub_dfs_by_size(df, 300), "b", agg)
+    _assert_agg_equal(res, df.groupby("b").agg(agg))
+    res = chunked_groupby_agg(sub_dfs_by_size(df, 300), ["a", "b"], "sum")
+    _assert_agg_equal(res, df.groupby(["a", "b"]).agg("sum"))
+
+
+def test_var_is_numerically_stable():
+    df = pd.DataFrame({"k": [0] * 4000, "v": 1e9 + np.arange(4000) % 4})
+    res = chunked_groupby_agg(sub_dfs_by_size(df, 100), "k", {"v": "var"})
+    assert res["v"].iloc[0] == pytest.approx(df["v"].var())
+
+
+def test_errors_and_empty_input():
+    with pytest.raises(ValueError):
+        chunked_groupby_agg(
+            sub_dfs_by_size(pd.DataFrame(DF_DATA), 100), "a", "median"
+        )
+    assert chunked_groupby_agg([], "a", "sum").empty
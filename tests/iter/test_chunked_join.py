@@ -0,0 +1,104 @@
+"""Test pdutil.iter.chunked_join."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.iter import chunked_join, sub_dfs_by_size
+from pdutil.serial import SerializationFormat
+
+LEFT_DATA = {
+    "k1": np.random.RandomState(1).randint(0, 60, 400),
+    "k2": np.random.RandomState(2).choice(list("ab"), 400),
+    "lval": range(400),
+}
+RIGHT_DATA = {
+    "k1": np.random.RandomState(3).randint(30, 90, 300),
+    "k2": np.random.RandomState(4).choice(list("ab"), 300),
+    "rval": range(300),
+}
+
+
+def _sorted(df):
+    return df.sort_values(list(df.columns), ignore_index=True)
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+@pytest.mark.parametrize("on", ["k1", ["k1", "k2"]])
+def test_matches_merge(tmpdir, how, on):
+    left = pd.DataFrame(LEFT_DATA)
+    right = pd.DataFrame(RIGHT_DATA)
+    joined = chunked_join(
+        sub_dfs_by_size(left, 70),
+        sub_dfs_by_size(right, 50),
+        on=on,
+        how=how,
+        num_partitions=5,
+        tmp_dir=str(tmpdir),
+    )
+    res = pd.concat(list(joined))
+    expected = pd.merge(left, right, on=on, how=how)
+    pd.testing.assert_frame_equal(_sorted(res), _sorted(expected))
+    assert tmpdir.listdir() == []
+
+
+def test_process_pool():
+    left = pd.DataFrame(LEFT_DATA)
+    right = pd.DataFrame(RIGHT_DATA)
+    joined = chunked_join(
+        sub_dfs_by_size(left, 100),
+        sub_dfs_by_size(right, 100),
+        on="k1",
+        num_partitions=6,
+        processes=2,
+        suffixes=("_l", "_r"),
+    )
+    res = pd.concat(list(joined))
+    expected = pd.merge(left, right, on="k1", suffixes=("_l", "_r"))
+    pd.testing.assert_frame_equal(_sorted(res), _sorted(expected))
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_custom_serial_format(tmpdir, processes):
+    # a format that is not registered by name
+    serial_format = SerializationFormat(
+        ext="pq",
+        serialize=pd.DataFrame.to_pickle,
+        deserialize=pd.read_pickle,
+    )
+    left = pd.DataFrame(LEFT_DATA)
+    right = pd.DataFrame(RIGHT_DATA)
+    joined = chunked_join(
+        sub_dfs_by_size(left, 100),
+        sub_dfs_by_size(right, 100),
+        on="k1",
+        num_partitions=3,
+        processes=processes,
+        tmp_dir=str(tmpdir),
+        serial_format=serial_format,
+    )
+    res = pd.concat(list(joined))
+    expected = pd.merge(left, right, on="k1")
+    pd.testing.assert_frame_equal(_sorted(res), _sorted(expected))
+
+
+def test_keys_of_changing_dtypes(tmpdir):
+    # a missing key makes the second left chunk a float one
+    left = pd.DataFrame(
+        {"k1": [1.0, 2.0, 3.0, np.nan, 2.0, 3.0], "lval": range(6)}
+    )
+    left_chunks = [left.iloc[:3].astype({"k1": "int64"}), left.iloc[3:]]
+    right = pd.DataFrame({"k1": [1, 2, 3], "rval": range(3)})
+    joined = chunked_join(
+        left_chunks, [right], on="k1", num_partitions=8, tmp_dir=str(tmpdir)
+    )
+    res = pd.concat(list(joined))
+    expected = pd.merge(left, right, on="k1")
+    assert len(res) == 5
+    pd.testing.assert_frame_equal(_sorted(res), _sorted(expected))
+
+
+def test_empty_side():
+    left = pd.DataFrame(LEFT_DATA)
+    with pytest.raises(ValueError):
+        list(chunked_join(sub_dfs_by_size(left, 100), [], on="k1"))
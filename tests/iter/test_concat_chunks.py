@@ -0,0 +1,92 @@
+"""Test pdutil.iter.concat_chunks."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.iter import concat_chunks, sub_dfs_by_size
+
+NUM_ROWS = 100
+DF_DATA = {
+    "i": np.arange(NUM_ROWS),
+    "f": np.random.RandomState(1).rand(NUM_ROWS),
+    "b": np.random.RandomState(2).rand(NUM_ROWS) > 0.5,
+    "s": np.random.RandomState(3).choice(["Jen", "Ray", None], NUM_ROWS),
+    "cat": pd.Categorical(
+        np.random.RandomState(4).choice(list("xyz"), NUM_ROWS)
+    ),
+    "t": pd.date_range("2019-01-01", periods=NUM_ROWS, tz="UTC"),
+    "n": pd.array(
+        np.random.RandomState(5).randint(0, 5, NUM_ROWS), dtype="Int64"
+    ),
+}
+
+
+@pytest.mark.parametrize("total_rows", [None, 1, 100, 500])
+def test_range_index(total_rows):
+    df = pd.DataFrame(DF_DATA)
+    res = concat_chunks(sub_dfs_by_size(df, 7), total_rows=total_rows)
+    pd.testing.assert_frame_equal(res, df)
+    assert isinstance(res.index, pd.RangeIndex)
+
+
+def test_other_indexes():
+    df = pd.DataFrame(DF_DATA).set_index("s")
+    pd.testing.assert_frame_equal(concat_chunks(sub_dfs_by_size(df, 9)), df)
+    df = pd.DataFrame(DF_DATA).iloc[::-1]
+    pd.testing.assert_frame_equal(concat_chunks(sub_dfs_by_size(df, 9)), df)
+    df = pd.DataFrame(DF_DATA)
+    chunks = [df.iloc[:30], df.iloc[60:], df.iloc[30:60]]
+    pd.testing.assert_frame_equal(concat_chunks(chunks), pd.concat(chunks))
+
+
+def test_consumes_generator_lazily():
+    df = pd.DataFrame(DF_DATA)
+    alive = []
+
+    def _chunks():
+        for subdf in sub_dfs_by_size(df, 10):
+            alive.append(subdf)
+            yield subdf
+            alive.pop()
+
+    pd.testing.assert_frame_equal(concat_chunks(_chunks()), df)
+    assert alive == []
+
+
+def test_schema_change_falls_back():
+    df = pd.DataFrame(DF_DATA)
+    chunks = [df.iloc[:40], df.iloc[40:70].astype({"i": float}), df.iloc[70:]]
+    pd.testing.assert_frame_equal(concat_chunks(chunks), pd.concat(chunks))
+    chunks = [df.iloc[:40], df.iloc[40:].set_index("s")]
+    pd.testing.assert_frame_equal(concat_chunks(chunks), pd.concat(chunks))
+
+
+def test_empty():
+    assert concat_chunks([]).empty
+    df = pd.DataFrame(DF_DATA)
+    pd.testing.assert_frame_equal(
+        concat_chunks([df.iloc[:0], df, df.iloc[:0]]), df
+    )
+
+
+def test_single_dtype():
+    df = pd.DataFrame(np.arange(60.0).reshape(20, 3), columns=list("abc"))
+    res = concat_chunks(sub_dfs_by_size(df, 6), total_rows=20)
+    pd.testing.assert_frame_equal(res, df)
+    df = pd.DataFrame({"s": list("abcdefgh")})
+    pd.testing.assert_frame_equal(concat_chunks(sub_dfs_by_size(df, 3)), df)
+    chunks = [df.iloc[:3], df.iloc[3:].astype(object)]
+    pd.testing.assert_frame_equal(concat_chunks(chunks), pd.concat(chunks))
+
+
+def test_object_columns():
+    df = pd.DataFrame(DF_DATA).astype(object)
+    df.index = pd.Index(df["s"].fillna("-").to_numpy(), dtype=object)
+    res = concat_chunks(sub_dfs_by_size(df, 7))
+    pd.testing.assert_frame_equal(res, df)
+    assert (res.dtypes == object).all()
+    assert res.index.dtype == object
+    df = df[["s"]]
+    res = concat_chunks(sub_dfs_by_size(df, 7), total_rows=100)
+    pd.testing.assert_frame_equal(res, df)
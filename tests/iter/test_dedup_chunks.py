@@ -0,0 +1,69 @@
+"""Test pdutil.iter.dedup_chunks and pdutil.iter.BloomFilter."""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.iter import BloomFilter, dedup_chunks, sub_dfs_by_size
+
+NUM_ROWS = 20000
+EVENTS_DATA = {
+    "user": np.random.RandomState(1).randint(0, 3000, NUM_ROWS),
+    "kind": np.random.RandomState(2).choice(["view", "click"], NUM_ROWS),
+    "ts": np.random.RandomState(3).randint(0, 5, NUM_ROWS),
+}
+
+
+@pytest.mark.parametrize("subset", [None, ["user"], ["user", "kind"]])
+def test_exact_matches_drop_duplicates(subset):
+    df = pd.DataFrame(EVENTS_DATA)
+    chunks = list(dedup_chunks(sub_dfs_by_size(df, 1500), subset=subset))
+    assert len(chunks) == 14
+    res = pd.concat(chunks)
+    assert res.equals(df.drop_duplicates(subset=subset))
+
+
+def test_bloom():
+    df = pd.DataFrame(EVENTS_DATA)
+    expected = df.drop_duplicates()
+    chunks = dedup_chunks(
+        sub_dfs_by_size(df, 1500),
+        method="bloom",
+        capacity=len(expected),
+        error_rate=0.01,
+    )
+    res = pd.concat(list(chunks))
+    # false positives only ever drop rows
+    assert set(res.index) <= set(expected.index)
+    assert len(res) >= 0.97 * len(expected)
+    assert not res.duplicated().any()
+
+
+@pytest.mark.parametrize("method", ["exact", "bloom"])
+def test_changing_dtypes(method):
+    # a missing value makes the second chunk a float one
+    csv = "user,page\n1,x\n2,y\n1,x\n,z\n2,y\n"
+    chunks = pd.read_csv(io.StringIO(csv), chunksize=3)
+    res = dedup_chunks(chunks, method=method, capacity=10)
+    assert [list(chunk.index) for chunk in res] == [[0, 1], [3]]
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        list(dedup_chunks([pd.DataFrame(EVENTS_DATA)], method="bloom"))
+    with pytest.raises(ValueError):
+        list(dedup_chunks([pd.DataFrame(EVENTS_DATA)], method="magic"))
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    bloom.update(np.arange(10000))
+    assert bloom.contains(np.arange(10000)).all()
+    false_positive_rate = bloom.contains(np.arange(10000, 30000)).mean()
+    assert false_positive_rate < 0.02
+    other = BloomFilter(capacity=10000, error_rate=0.01).update([-1])
+    assert bloom.merge(other).contains([-1]).all()
+    with pytest.raises(ValueError):
+        bloom.merge(BloomFilter(capacity=10))
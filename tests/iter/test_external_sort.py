@@ -0,0 +1,85 @@
+"""Test pdutil.iter.external_sort."""
+
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.iter import external_sort, sub_dfs_by_size
+
+NUM_ROWS = 1000
+DF_DATA = {
+    "a": np.random.RandomState(1).randint(0, 20, NUM_ROWS),
+    "b": np.random.RandomState(2).choice(list("abcdefg"), NUM_ROWS),
+    "t": pd.Timestamp("2019-01-01")
+    + pd.to_timedelta(np.random.RandomState(3).randint(0, 100, NUM_ROWS), "h"),
+    "val": range(NUM_ROWS),
+}
+
+
+@pytest.mark.parametrize(
+    "by", ["a", ["a", "b"], ["b", "t"], ["t", "a", "b"], "val"]
+)
+@pytest.mark.parametrize("block_size", [7, 50, 1000])
+def test_matches_stable_sort(tmpdir, by, block_size):
+    df = pd.DataFrame(DF_DATA)
+    chunks = sub_dfs_by_size(df, 130)
+    res = pd.concat(
+        external_sort(chunks, by, block_size=block_size, tmp_dir=str(tmpdir))
+    )
+    assert res.equals(df.sort_values(by, kind="mergesort"))
+    assert tmpdir.listdir() == []
+
+
+@pytest.mark.parametrize("max_rows, fan_in", [(30, 2), (50, 3), (200, 16)])
+def test_multi_pass_merge(tmpdir, monkeypatch, max_rows, fan_in):
+    outofcore = sys.modules["pdutil.iter.outofcore"]
+    merge_sorted = outofcore.merge_sorted
+    fan_ins = []
+
+    def counting_merge_sorted(iterators, by):
+        fan_ins.append(len(iterators))
+        return merge_sorted(iterators, by)
+
+    monkeypatch.setattr(outofcore, "merge_sorted", counting_merge_sorted)
+    df = pd.DataFrame(DF_DATA)
+    chunks = sub_dfs_by_size(df, 30)
+    res = pd.concat(
+        external_sort(
+            chunks,
+            ["a", "b"],
+            tmp_dir=str(tmpdir),
+            max_rows=max_rows,
+            fan_in=fan_in,
+        )
+    )
+    assert res.equals(df.sort_values(["a", "b"], kind="mergesort"))
+    assert max(fan_ins) <= fan_in
+    # chunks are buffered into runs of at least max_rows rows
+    run_rows = max(1, -(-max_rows // 30)) * 30
+    num_runs = -(-len(df) // run_rows)
+    assert (len(fan_ins) > 1) == (num_runs > fan_in)
+    assert tmpdir.listdir() == []
+
+
+def test_invalid_fan_in():
+    with pytest.raises(ValueError):
+        list(external_sort([pd.DataFrame(DF_DATA)], "a", fan_in=1))
+
+
+def test_cleanup_on_early_exit(tmpdir):
+    sorted_chunks = external_sort(
+        sub_dfs_by_size(pd.DataFrame(DF_DATA), 100),
+        "a",
+        block_size=10,
+        tmp_dir=str(tmpdir),
+    )
+    next(sorted_chunks)
+    assert len(tmpdir.listdir()) == 1
+    sorted_chunks.close()
+    assert tmpdir.listdir() == []
+
+
+def test_empty_input():
+    assert list(external_sort([], "a")) == []
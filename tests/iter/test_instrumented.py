@@ -0,0 +1,74 @@
+"""Test pdutil.iter.instrumented."""
+
+import logging
+import time
+
+import pandas as pd
+
+from pdutil.iter import instrumented, sub_dfs_by_size
+
+
+def _slow_chunks(df, size):
+    for subdf in sub_dfs_by_size(df, size):
+        time.sleep(0.01)
+        yield subdf
+
+
+def test_stats():
+    df = pd.DataFrame({"val": range(100)})
+    reports = []
+    for _ in instrumented(_slow_chunks(df, 30), reports.append, "test"):
+        time.sleep(0.02)
+    assert len(reports) == 1
+    stats = reports[0]
+    assert stats["name"] == "test"
+    assert stats["chunks"] == 4
+    assert stats["rows"] == 100
+    assert stats["bytes"] >= 800
+    assert stats["produce_seconds"] >= 0.04
+    assert stats["consume_seconds"] >= 0.08
+    assert stats["consume_seconds"] > stats["produce_seconds"]
+    assert 0 < stats["rows_per_second"] <= 100 / 0.12
+    assert stats["latency_p50"] <= stats["latency_p90"]
+    assert stats["latency_p90"] <= stats["latency_p99"]
+
+
+def test_report_every_and_early_exit():
+    df = pd.DataFrame({"val": range(100)})
+    reports = []
+    chunks = instrumented(
+        sub_dfs_by_size(df, 10), reports.append, report_every=3
+    )
+    for i, _ in enumerate(chunks):
+        if i == 6:
+            break
+    chunks.close()
+    assert [stats["chunks"] for stats in reports] == [3, 6, 7]
+    assert reports[-1]["rows"] == 70
+
+
+def test_report_every_no_duplicate_final_report():
+    df = pd.DataFrame({"val": range(100)})
+    reports = []
+    list(instrumented(sub_dfs_by_size(df, 10), reports.append, report_every=5))
+    assert [stats["chunks"] for stats in reports] == [5, 10]
+    reports = []
+    list(instrumented([], reports.append, report_every=5))
+    assert [stats["chunks"] for stats in reports] == [0]
+
+
+def test_logging(caplog):
+    df = pd.DataFrame({"val": range(10)})
+    with caplog.at_level(logging.INFO, logger="pdutil.iter.instrument"):
+        list(instrumented(sub_dfs_by_size(df, 3), name="nightly"))
+    assert "nightly: 4 chunks, 10 rows" in caplog.text
+
+
+def test_non_pandas_chunks():
+    reports = []
+    list(instrumented([[1, 2], [3]], reports.append))
+    assert reports[0]["rows"] == 3
+
+    list(instrumented(iter([1, 2]), reports.append))
+    assert reports[1]["rows"] == 2
+    assert reports[1]["bytes"] == 0
@@ -0,0 +1,57 @@
+"""Test pdutil.iter.iter_rows."""
+
+import pandas as pd
+import pytest
+
+from pdutil.iter import iter_rows, sub_dfs_by_size
+
+DF_DATA = {
+    "age": [23, 42, 15],
+    "name": ["Jen", "Ray", "Fin"],
+    "score": [0.5, 1.5, 2.0],
+    "time": pd.to_datetime(["2019-01-01", "2019-01-02", "2019-01-03"]),
+}
+DF_IX = [10, 11, 12]
+
+
+def _expected(df, index=False):
+    return [
+        tuple(row)[0 if index else 1 :] for row in df.itertuples(index=True)
+    ]
+
+
+@pytest.mark.parametrize("index", [False, True])
+def test_tuples_match_itertuples(index):
+    df = pd.DataFrame(DF_DATA, DF_IX)
+    assert list(iter_rows(df, index=index)) == _expected(df, index)
+    chunks = sub_dfs_by_size(df, 2)
+    assert list(iter_rows(chunks, index=index)) == _expected(df, index)
+
+
+def test_native_values():
+    row = next(iter_rows(pd.DataFrame(DF_DATA, DF_IX)))
+    assert type(row[0]) is int
+    assert type(row[2]) is float
+    assert isinstance(row[3], pd.Timestamp)
+
+
+def test_objects():
+    df = pd.DataFrame(DF_DATA, DF_IX)
+    rows = list(iter_rows(sub_dfs_by_size(df, 2), "object", index=True))
+    assert [row.age for row in rows] == [23, 42, 15]
+    assert [row.Index for row in rows] == [10, 11, 12]
+    assert type(rows[0]) is type(rows[2])
+    with pytest.raises(AttributeError):
+        rows[0].other = 1
+
+
+def test_object_field_names():
+    df = pd.DataFrame([[1, 2, 3, 4]], columns=["a", "class", "a", 7])
+    row = next(iter_rows(df, "object", name="Record"))
+    assert (row.a, row._1, row._2, row._3) == (1, 2, 3, 4)
+    assert repr(row) == "Record(a=1, _1=2, _2=3, _3=4)"
+
+
+def test_bad_row_type():
+    with pytest.raises(ValueError):
+        list(iter_rows(pd.DataFrame(DF_DATA, DF_IX), "dict"))
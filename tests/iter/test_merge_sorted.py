@@ -0,0 +1,53 @@
+"""Test pdutil.iter.merge_sorted."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.iter import merge_sorted, sub_dfs_by_size
+
+SHARDS_DATA = [
+    {
+        "a": np.random.RandomState(i).randint(0, 30, 50 + i * 37 % 250),
+        "b": np.random.RandomState(100 + i).choice(
+            list("xyz"), 50 + i * 37 % 250
+        ),
+        "shard": i,
+    }
+    for i in range(40)
+]
+
+
+def _sorted_shards(by, num_shards=4):
+    return [
+        pd.DataFrame(data).sort_values(by, kind="mergesort")
+        for data in SHARDS_DATA[:num_shards]
+    ]
+
+
+@pytest.mark.parametrize("by", ["a", ["a", "b"], ["b", "a"]])
+@pytest.mark.parametrize("size", [1, 13, 1000])
+def test_matches_stable_sort(by, size):
+    shards = _sorted_shards(by)
+    iterators = [sub_dfs_by_size(shard, size) for shard in shards]
+    res = pd.concat(list(merge_sorted(iterators, by)))
+    expected = pd.concat(shards).sort_values(by, kind="mergesort")
+    assert res.equals(expected)
+
+
+def test_empty_iterators():
+    shards = _sorted_shards("a", 2)
+    empty = shards[0].iloc[:0]
+    iterators = [[], [empty, shards[0], empty], iter([shards[1]])]
+    res = pd.concat(list(merge_sorted(iterators, "a")))
+    expected = pd.concat(shards).sort_values("a", kind="mergesort")
+    assert res.equals(expected)
+    assert list(merge_sorted([[], []], "a")) == []
+
+
+def test_many_iterators():
+    shards = _sorted_shards(["a", "b"], 40)
+    iterators = [sub_dfs_by_size(shard, 17) for shard in shards]
+    res = pd.concat(list(merge_sorted(iterators, ["a", "b"])))
+    expected = pd.concat(shards).sort_values(["a", "b"], kind="mergesort")
+    assert res.equals(expected)
@@ -0,0 +1,63 @@
+"""Test pdutil.iter.prefetch."""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from pdutil.iter import prefetch, sub_dfs_by_size
+
+
+def test_yields_all_chunks_in_order():
+    df = pd.DataFrame({"val": range(100)})
+    chunks = list(prefetch(sub_dfs_by_size(df, 7), num=3))
+    assert pd.concat(chunks).equals(df)
+
+
+def test_bounded_prefetch():
+    produced = []
+
+    def _chunks():
+        for i in range(20):
+            produced.append(i)
+            yield i
+
+    res = prefetch(_chunks(), num=2)
+    assert next(res) == 0
+    time.sleep(0.2)
+    # one consumed, two in the buffer and one held by the producer
+    assert len(produced) <= 4
+    assert list(res) == list(range(1, 20))
+
+
+def test_producer_error():
+    def _chunks():
+        yield 1
+        raise KeyError("bad chunk")
+
+    res = prefetch(_chunks())
+    assert next(res) == 1
+    with pytest.raises(KeyError):
+        next(res)
+
+
+def test_abandoned_consumer_stops_producer():
+    def _chunks():
+        i = 0
+        while True:
+            yield i
+            i += 1
+
+    num_threads = threading.active_count()
+    res = prefetch(_chunks(), num=1)
+    next(res)
+    res.close()
+    time.sleep(0.3)
+    assert threading.active_count() == num_threads
+
+
+def test_bad_num():
+    for num in [0, -1]:
+        with pytest.raises(ValueError):
+            list(prefetch(range(3), num))
@@ -0,0 +1,81 @@
+"""Test pdutil.iter.run_resumable."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from pdutil.iter import run_resumable, sub_dfs_by_num, sub_dfs_by_size
+from pdutil.serial import SerializationFormat
+
+
+class _Preempted(Exception):
+    pass
+
+
+DF_DATA = {"val": range(50), "txt": ["a", "b"] * 25}
+
+
+def test_resume_after_crash(tmpdir):
+    df = pd.DataFrame(DF_DATA)
+    checkpoint_path = str(tmpdir.join("checkpoint.json"))
+    processed = []
+
+    def _crashing(subdf):
+        if len(processed) == 3:
+            raise _Preempted()
+        processed.append(subdf.index[0])
+
+    with pytest.raises(_Preempted):
+        run_resumable(sub_dfs_by_size(df, 10), _crashing, checkpoint_path)
+    assert processed == [0, 10, 20]
+
+    def _process(subdf):
+        processed.append(subdf.index[0])
+
+    run_resumable(sub_dfs_by_size(df, 10), _process, checkpoint_path)
+    assert processed == [0, 10, 20, 30, 40]
+    run_resumable(sub_dfs_by_size(df, 10), _process, checkpoint_path)
+    assert len(processed) == 5
+
+
+def test_outputs(tmpdir):
+    df = pd.DataFrame(DF_DATA)
+    checkpoint_path = str(tmpdir.join("checkpoint.json"))
+    output_dir = str(tmpdir.join("out"))
+    calls = []
+
+    def _double(subdf):
+        calls.append(len(subdf))
+        if len(calls) == 2:
+            raise _Preempted()
+        return subdf.assign(val=subdf["val"] * 2)
+
+    with pytest.raises(_Preempted):
+        run_resumable(
+            sub_dfs_by_num(df, 4), _double, checkpoint_path, output_dir
+        )
+    paths = run_resumable(
+        sub_dfs_by_num(df, 4), _double, checkpoint_path, output_dir
+    )
+    assert len(calls) == 5
+    assert len(paths) == 4
+    assert all(os.path.exists(path) for path in paths)
+    fmt = SerializationFormat.pickle
+    res = pd.concat([fmt.deserialize(path) for path in paths])
+    assert res.equals(df.assign(val=df["val"] * 2))
+
+
+def test_csv_outputs(tmpdir):
+    paths = run_resumable(
+        sub_dfs_by_size(pd.DataFrame(DF_DATA), 20),
+        lambda subdf: subdf,
+        str(tmpdir.join("checkpoint.json")),
+        str(tmpdir),
+        serial_format=SerializationFormat.csv,
+    )
+    assert [os.path.basename(path) for path in paths] == [
+        "chunk_000000.csv",
+        "chunk_000001.csv",
+        "chunk_000002.csv",
+    ]
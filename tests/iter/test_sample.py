@@ -0,0 +1,89 @@
+"""Test pdutil.iter.sample."""
+
+import numpy as np
+import pandas as pd
+
+from pdutil.iter import (
+    reservoir_sample,
+    stratified_sample,
+    sub_dfs_by_size,
+)
+
+NUM_ROWS = 1000
+DF_DATA = {
+    "val": np.arange(NUM_ROWS),
+    "kind": np.where(np.arange(NUM_ROWS) % 10 == 0, "b", "a"),
+}
+
+
+def test_reservoir_sample():
+    df = pd.DataFrame(DF_DATA)
+    sample = reservoir_sample(sub_dfs_by_size(df, 97), 20, random_state=1)
+    assert len(sample) == 20
+    assert sample.index.is_unique
+    assert sample.index.is_monotonic_increasing
+    assert (df.loc[sample.index].val == sample.val).all()
+
+
+def test_reservoir_sample_few_rows():
+    df = pd.DataFrame(DF_DATA).iloc[:15]
+    sample = reservoir_sample(sub_dfs_by_size(df, 4), 20, random_state=1)
+    assert sample.equals(df)
+
+
+def test_reservoir_sample_no_chunks():
+    assert len(reservoir_sample([], 5)) == 0
+
+
+def test_reservoir_sample_zero_rows():
+    df = pd.DataFrame(DF_DATA)
+    sample = reservoir_sample(sub_dfs_by_size(df, 50), 0, random_state=1)
+    assert sample.equals(df.iloc[:0])
+
+
+def test_reservoir_sample_deterministic():
+    df = pd.DataFrame(DF_DATA)
+    first = reservoir_sample(sub_dfs_by_size(df, 50), 10, random_state=3)
+    second = reservoir_sample(sub_dfs_by_size(df, 50), 10, random_state=3)
+    assert first.equals(second)
+
+
+def test_reservoir_sample_uniform():
+    df = pd.DataFrame(DF_DATA).iloc[:20]
+    counts = np.zeros(20)
+    for seed in range(400):
+        sample = reservoir_sample(sub_dfs_by_size(df, 3), 5, random_state=seed)
+        counts[sample.val.values] += 1
+    # each row is expected to be sampled 400 * 5 / 20 = 100 times
+    assert np.all(np.abs(counts - 100) < 40)
+
+
+def test_stratified_sample_int_quota():
+    df = pd.DataFrame(DF_DATA)
+    sample = stratified_sample(
+        sub_dfs_by_size(df, 64), "kind", 7, random_state=0
+    )
+    assert sample.kind.value_counts().to_dict() == {"a": 7, "b": 7}
+    assert sample.index.is_monotonic_increasing
+    assert (df.loc[sample.index].val == sample.val).all()
+
+
+def test_stratified_sample_dict_quota():
+    df = pd.DataFrame(DF_DATA)
+    sample = stratified_sample(
+        sub_dfs_by_size(df, 64), "kind", {"b": 200}, random_state=0
+    )
+    assert len(sample) == 100
+    assert (sample.kind == "b").all()
+
+
+def test_stratified_sample_multiple_columns():
+    df = pd.DataFrame(DF_DATA)
+    df["parity"] = df.val % 2
+    chunks = sub_dfs_by_size(df, 64)
+    quotas = {("a", 0): 3, ("a", 1): 4, ("b", 0): 5}
+    sample = stratified_sample(
+        chunks, ["kind", "parity"], quotas, random_state=0
+    )
+    counts = sample.groupby(["kind", "parity"]).size().to_dict()
+    assert counts == quotas
@@ -0,0 +1,119 @@
+"""Test the streaming sketches of pdutil.iter."""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.iter import (
+    CountMinSketch,
+    HyperLogLog,
+    KLLSketch,
+    sub_dfs_by_num,
+    sub_dfs_by_size,
+)
+
+NUM_ROWS = 200000
+DF_DATA = {
+    "user": np.random.RandomState(1).randint(0, 50000, NUM_ROWS),
+    "name": np.random.RandomState(2).zipf(1.5, NUM_ROWS).astype(str),
+    "latency": np.random.RandomState(3).lognormal(3, 1, NUM_ROWS),
+}
+
+
+@pytest.mark.parametrize("col", ["user", "name"])
+def test_hll_count(col):
+    df = pd.DataFrame(DF_DATA)
+    hll = HyperLogLog()
+    for subdf in sub_dfs_by_size(df, 30000):
+        hll.update(subdf[col])
+    expected = df[col].nunique()
+    assert abs(hll.count() - expected) <= 0.03 * expected
+
+
+def test_hll_small_and_merge():
+    hll = HyperLogLog().update([1, 2, 3, np.nan, 3])
+    assert hll.count() == 3
+    df = pd.DataFrame(DF_DATA)
+    parts = [HyperLogLog(12).update(sub.user) for sub in sub_dfs_by_num(df, 4)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    whole = HyperLogLog(12).update(df.user)
+    assert np.array_equal(merged.registers, whole.registers)
+    with pytest.raises(ValueError):
+        merged.merge(HyperLogLog(14))
+
+
+def test_kll_quantiles():
+    df = pd.DataFrame(DF_DATA)
+    kll = KLLSketch(random_state=0)
+    for subdf in sub_dfs_by_size(df, 7000):
+        kll.update(subdf.latency)
+    assert kll.num_values == len(df)
+    qs = np.array([0.01, 0.25, 0.5, 0.9, 0.99])
+    estimates = kll.quantile(qs)
+    ranks = np.searchsorted(np.sort(df.latency.values), estimates) / len(df)
+    assert np.all(np.abs(ranks - qs) < 0.02)
+    assert sum(len(items) for items in kll.compactors) < 2000
+
+
+def test_kll_merge_and_empty():
+    df = pd.DataFrame(DF_DATA)
+    parts = [
+        KLLSketch(random_state=i).update(subdf.latency)
+        for i, subdf in enumerate(sub_dfs_by_num(df, 5))
+    ]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    rank = (df.latency < merged.quantile(0.5)).mean()
+    assert abs(rank - 0.5) < 0.02
+    assert np.isnan(KLLSketch().quantile(0.5))
+
+
+def test_count_min():
+    df = pd.DataFrame(DF_DATA)
+    cms = CountMinSketch(top_k=5)
+    for subdf in sub_dfs_by_size(df, 40000):
+        cms.update(subdf.name)
+    counts = df.name.value_counts()
+    estimates = cms.estimate(counts.index)
+    assert np.all(estimates >= counts.values)
+    assert np.all(estimates - counts.values <= 2.7 * len(df) / cms.width)
+    assert list(cms.heavy_hitters().index) == list(counts.index[:5])
+    assert list(cms.heavy_hitters(2).index) == list(counts.index[:2])
+
+
+def test_count_min_merge():
+    df = pd.DataFrame(DF_DATA)
+    parts = [
+        CountMinSketch(top_k=3).update(subdf.name)
+        for subdf in sub_dfs_by_num(df, 3)
+    ]
+    merged = parts[0].merge(parts[1]).merge(parts[2])
+    whole = CountMinSketch(top_k=3).update(df.name)
+    assert np.array_equal(merged.table, whole.table)
+    assert merged.heavy_hitters().equals(whole.heavy_hitters())
+    with pytest.raises(ValueError):
+        merged.merge(CountMinSketch(width=10))
+
+
+def test_mixed_dtypes():
+    hll = (
+        HyperLogLog()
+        .update([1, 2, 3])
+        .merge(HyperLogLog().update([1.0, 2.0, 3.0]))
+    )
+    assert hll.count() == 3
+    # a missing value makes the second chunk a float one
+    csv = "user,page\n1,x\n2,y\n1,x\n,z\n2,y\n"
+    hll = HyperLogLog()
+    cms = CountMinSketch()
+    for chunk in pd.read_csv(io.StringIO(csv), chunksize=3):
+        hll.update(chunk.user)
+        cms.update(chunk.user)
+    assert hll.count() == 2
+    assert list(cms.estimate([1, 2])) == [2, 2]
+    assert cms.heavy_hitters().tolist() == [2, 2]
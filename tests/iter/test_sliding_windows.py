@@ -0,0 +1,43 @@
+"""Test pdutil.iter.sliding_windows."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.iter import sliding_windows
+
+DF_DATA = {
+    "a": np.arange(10),
+    "txt": list("abcdefghij"),
+    "b": np.arange(10) * 0.5,
+}
+
+
+@pytest.mark.parametrize("window, step", [(1, 1), (3, 1), (3, 2), (4, 3)])
+def test_array_matches_slices(window, step):
+    df = pd.DataFrame(DF_DATA)
+    view = sliding_windows(df, window, step, as_array=True)
+    slices = list(sliding_windows(df, window, step))
+    assert view.shape == (len(slices), window, 2)
+    for subview, subdf in zip(view, slices):
+        assert np.array_equal(subview, subdf[["a", "b"]].values)
+
+
+def test_array_is_read_only_view():
+    df = pd.DataFrame({"a": np.arange(6.0), "b": np.arange(6.0)})
+    view = sliding_windows(df, 4, as_array=True)
+    assert not view.flags.writeable
+    assert view.base is not None
+
+
+def test_window_bigger_than_df():
+    df = pd.DataFrame(DF_DATA)
+    assert list(sliding_windows(df, 11)) == []
+    assert sliding_windows(df, 11, as_array=True).shape == (0, 11, 2)
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        sliding_windows(pd.DataFrame(DF_DATA), 0)
+    with pytest.raises(ValueError):
+        sliding_windows(pd.DataFrame(DF_DATA), 2, step=0)
@@ -0,0 +1,48 @@
+"""Test pdutil.iter.sub_dfs_by_bytes."""
+
+import pandas as pd
+
+from pdutil.iter import sub_dfs_by_bytes
+from pdutil.iter.iter import _row_bytes
+
+DF_DATA = {
+    "num": range(100),
+    "txt": ["x" * 500 if i % 10 == 0 else "y" for i in range(100)],
+}
+
+
+def test_chunks_stay_under_budget():
+    df = pd.DataFrame(DF_DATA)
+    max_bytes = 2000
+    chunks = list(sub_dfs_by_bytes(df, max_bytes))
+    assert sum(len(chunk) for chunk in chunks) == len(df)
+    assert pd.concat(chunks).equals(df)
+    row_bytes = _row_bytes(df)
+    start = 0
+    for chunk in chunks:
+        assert row_bytes[start : start + len(chunk)].sum() <= max_bytes
+        start += len(chunk)
+
+
+def test_varying_row_widths():
+    df = pd.DataFrame(DF_DATA)
+    chunks = list(sub_dfs_by_bytes(df, 2000))
+    assert len(set(len(chunk) for chunk in chunks)) > 1
+
+
+def test_row_over_budget():
+    df = pd.DataFrame({"txt": ["a" * 5000, "b"]})
+    chunks = list(sub_dfs_by_bytes(df, 100))
+    assert [len(chunk) for chunk in chunks] == [1, 1]
+
+
+def test_sampled():
+    df = pd.DataFrame(DF_DATA)
+    df["txt"] = df["txt"].astype(object)
+    chunks = list(sub_dfs_by_bytes(df, 2000, sample_size=10, random_state=0))
+    assert pd.concat(chunks).equals(df)
+
+
+def test_empty():
+    df = pd.DataFrame({"num": []})
+    assert list(sub_dfs_by_bytes(df, 100)) == []
@@ -0,0 +1,60 @@
+"""Test pdutil.iter.sub_dfs_by_group."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.iter import sub_dfs_by_group
+
+
+def _assert_no_split(chunks, key):
+    seen = set()
+    for chunk in chunks:
+        chunk_keys = set(chunk[key].fillna(-1))
+        assert not chunk_keys & seen
+        seen |= chunk_keys
+
+
+def test_contiguous_groups():
+    df = pd.DataFrame({"key": np.repeat(np.arange(20), 7), "val": range(140)})
+    chunks = list(sub_dfs_by_group(df, "key", 30))
+    _assert_no_split(chunks, "key")
+    assert pd.concat(chunks).equals(df)
+    for chunk in chunks[:-1]:
+        assert 24 <= len(chunk) <= 36
+
+
+def test_interleaved_groups():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"key": rng.randint(0, 15, 300), "val": range(300)})
+    chunks = list(sub_dfs_by_group(df, "key", 50))
+    _assert_no_split(chunks, "key")
+    res = pd.concat(chunks)
+    assert len(res) == len(df)
+    assert res.sort_index().equals(df)
+
+
+def test_missing_keys_and_multiple_columns():
+    df = pd.DataFrame(
+        {
+            "a": [1, np.nan, 1, np.nan, 2, 2],
+            "b": ["x", "y", "x", "y", "x", "z"],
+        }
+    )
+    chunks = list(sub_dfs_by_group(df, "a", 1))
+    assert [list(chunk.index) for chunk in chunks] == [[0, 2], [1, 3], [4, 5]]
+    chunks = list(sub_dfs_by_group(df, ["a", "b"], 1))
+    assert len(chunks) == 4
+
+
+def test_big_group():
+    df = pd.DataFrame({"key": [0] * 10 + [1], "val": range(11)})
+    chunks = list(sub_dfs_by_group(df, "key", 3))
+    assert [len(chunk) for chunk in chunks] == [10, 1]
+
+
+def test_bad_target_size():
+    df = pd.DataFrame({"key": [0, 0, 1], "val": range(3)})
+    for target_size in [0, -1]:
+        with pytest.raises(ValueError):
+            list(sub_dfs_by_group(df, "key", target_size))
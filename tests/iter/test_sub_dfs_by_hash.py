@@ -0,0 +1,45 @@
+"""Test pdutil.iter.sub_dfs_by_hash."""
+
+import numpy as np
+import pandas as pd
+
+from pdutil.iter import sub_dfs_by_hash
+
+NUM_ROWS = 500
+DF_DATA = {
+    "a": np.random.RandomState(1).randint(0, 50, NUM_ROWS),
+    "b": np.random.RandomState(2).choice(["x", "y", "z"], NUM_ROWS),
+    "val": range(NUM_ROWS),
+}
+
+
+def test_keys_in_one_partition():
+    df = pd.DataFrame(DF_DATA)
+    chunks = list(sub_dfs_by_hash(df, "a", 4))
+    assert len(chunks) == 4
+    assert sorted(pd.concat(chunks).index) == list(df.index)
+    seen = set()
+    for chunk in chunks:
+        assert chunk.index.is_monotonic_increasing
+        assert not set(chunk["a"]) & seen
+        seen |= set(chunk["a"])
+
+
+def test_multiple_keys():
+    df = pd.DataFrame(DF_DATA)
+    chunks = list(sub_dfs_by_hash(df, ["a", "b"], 3))
+    seen = set()
+    for chunk in chunks:
+        chunk_keys = set(zip(chunk["a"], chunk["b"]))
+        assert not chunk_keys & seen
+        seen |= chunk_keys
+
+
+def test_consistent_across_frames():
+    df = pd.DataFrame(DF_DATA)
+    left_chunks = list(sub_dfs_by_hash(df.iloc[:300], "a", 5))
+    right_chunks = list(sub_dfs_by_hash(df.iloc[300:], ["a"], 5))
+    for i, lchunk in enumerate(left_chunks):
+        for j, rchunk in enumerate(right_chunks):
+            if i != j:
+                assert not set(lchunk["a"]) & set(rchunk["a"])
@@ -0,0 +1,88 @@
+"""Test pdutil.iter.sub_dfs_by_num."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.iter import sub_dfs_by_num
+
+WEIGHTED_DATA = {
+    "val": range(1000),
+    # a few rows cost far more than the rest
+    "cost": np.where(
+        np.arange(1000) % 100 == 37,
+        400.0,
+        np.random.RandomState(1).randint(1, 5, 1000),
+    ),
+}
+
+
+def test_unweighted():
+    df = pd.DataFrame({"val": range(10)})
+    chunks = list(sub_dfs_by_num(df, 3))
+    assert [len(chunk) for chunk in chunks] == [3, 4, 3]
+
+
+def test_weighted_contiguous():
+    df = pd.DataFrame(WEIGHTED_DATA)
+    num = 4
+    chunks = list(sub_dfs_by_num(df, num, weights="cost"))
+    assert len(chunks) == num
+    assert pd.concat(chunks).equals(df)
+    target = df["cost"].sum() / num
+    for chunk in chunks:
+        assert abs(chunk["cost"].sum() - target) <= df["cost"].max()
+
+
+def test_weighted_by_array():
+    df = pd.DataFrame({"val": range(4)})
+    chunks = list(sub_dfs_by_num(df, 2, weights=[10, 1, 1, 10]))
+    assert [list(chunk.index) for chunk in chunks] == [[0, 1], [2, 3]]
+    chunks = list(sub_dfs_by_num(df, 2, weights=np.array([3, 1, 1, 1])))
+    assert [list(chunk.index) for chunk in chunks] == [[0], [1, 2, 3]]
+
+
+def test_weighted_greedy():
+    df = pd.DataFrame({"val": range(5)})
+    weights = [8, 4, 4, 1, 1]
+    chunks = list(sub_dfs_by_num(df, 2, weights=weights, contiguous=False))
+    assert [list(chunk.index) for chunk in chunks] == [[0, 3], [1, 2, 4]]
+
+
+def test_greedy_balances_better():
+    df = pd.DataFrame(WEIGHTED_DATA)
+    num = 8
+    contiguous = list(sub_dfs_by_num(df, num, weights="cost"))
+    greedy = list(sub_dfs_by_num(df, num, weights="cost", contiguous=False))
+    assert len(greedy) == num
+    assert sorted(pd.concat(greedy).index) == list(df.index)
+    for chunk in greedy:
+        assert chunk.index.is_monotonic_increasing
+    max_load = max(chunk["cost"].sum() for chunk in greedy)
+    assert max_load <= max(chunk["cost"].sum() for chunk in contiguous)
+
+
+def test_zero_weights():
+    df = pd.DataFrame({"val": range(6)})
+    for contiguous in [True, False]:
+        chunks = list(
+            sub_dfs_by_num(df, 3, weights=[0] * 6, contiguous=contiguous)
+        )
+        assert [len(chunk) for chunk in chunks] == [2, 2, 2]
+
+
+def test_more_chunks_than_rows():
+    df = pd.DataFrame({"val": range(2)})
+    chunks = list(sub_dfs_by_num(df, 4, weights=[1, 1]))
+    assert len(chunks) == 4
+    assert sum(len(chunk) for chunk in chunks) == 2
+    chunks = list(sub_dfs_by_num(df.iloc[:0], 3, weights=[]))
+    assert [len(chunk) for chunk in chunks] == [0, 0, 0]
+
+
+def test_bad_weights():
+    df = pd.DataFrame({"val": range(3)})
+    with pytest.raises(ValueError):
+        list(sub_dfs_by_num(df, 2, weights=[1, 2]))
+    with pytest.raises(ValueError):
+        list(sub_dfs_by_num(df, 2, weights=[1, -2, 3]))
@@ -0,0 +1,68 @@
+"""Test pdutil.iter.sub_dfs_by_time."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pdutil.iter import sub_dfs_by_time
+
+NUM_ROWS = 500
+OFFSETS = np.sort(
+    np.random.RandomState(1).randint(0, 10 * 24 * 3600, NUM_ROWS)
+)
+TICKS_DATA = {
+    "time": pd.Timestamp("2019-03-01") + pd.to_timedelta(OFFSETS, "s"),
+    "price": np.random.RandomState(2).rand(NUM_ROWS),
+}
+
+DAYS_DATA = {"time": pd.date_range("2021-01-01", "2022-12-31", freq="D")}
+
+
+@pytest.mark.parametrize("freq", ["h", "D", "6h", "W", "MS"])
+def test_matches_groupby(freq):
+    df = pd.DataFrame(TICKS_DATA)
+    chunks = list(sub_dfs_by_time(df, freq, on="time"))
+    grouper = pd.Grouper(key="time", freq=freq)
+    expected = [group for _, group in df.groupby(grouper)]
+    expected = [group for group in expected if len(group)]
+    assert len(chunks) == len(expected)
+    for chunk, group in zip(chunks, expected):
+        assert chunk.equals(group)
+
+
+@pytest.mark.parametrize("freq", ["ME", "QE", "YE", "BME", "W", "W-WED"])
+def test_end_anchored(freq):
+    df = pd.DataFrame(DAYS_DATA)
+    chunks = list(sub_dfs_by_time(df, freq, on="time"))
+    expected = df.resample(freq, on="time").size()
+    assert [len(chunk) for chunk in chunks] == expected[expected > 0].tolist()
+    if freq == "ME":
+        assert [len(chunk) for chunk in chunks[:2]] == [31, 28]
+    pd.testing.assert_frame_equal(pd.concat(chunks), df)
+
+
+def test_datetime_index_with_tz():
+    df = pd.DataFrame(TICKS_DATA)
+    df["time"] = pd.Timestamp("2019-03-01", tz="US/Eastern") + pd.to_timedelta(
+        OFFSETS, "s"
+    )
+    df = df.set_index("time")
+    chunks = list(sub_dfs_by_time(df, "D"))
+    assert pd.concat(chunks).equals(df)
+    for chunk in chunks:
+        assert len(set(chunk.index.date)) == 1
+
+
+def test_bucket_edges():
+    times = pd.to_datetime(["2019-01-01 23:59", "2019-01-02 00:00"])
+    df = pd.DataFrame({"val": [1, 2]}, index=times)
+    assert [len(chunk) for chunk in sub_dfs_by_time(df, "D")] == [1, 1]
+
+
+def test_errors():
+    df = pd.DataFrame(TICKS_DATA)
+    with pytest.raises(TypeError):
+        list(sub_dfs_by_time(df, "D"))
+    with pytest.raises(ValueError):
+        list(sub_dfs_by_time(df.iloc[::-1], "D", on="time"))
+    assert list(sub_dfs_by_time(df.iloc[:0], "D", on="time")) == []